@@ -121,10 +121,10 @@ fi
 
 # 2. Install Python dependencies
 echo "→ Installing Python dependencies..."
-python3 -m pip install --quiet --user httpx beautifulsoup4 python-frontmatter tiktoken 2>/dev/null || \
-pip3 install --quiet httpx beautifulsoup4 python-frontmatter tiktoken 2>/dev/null || \
+python3 -m pip install --quiet --user httpx beautifulsoup4 lxml python-frontmatter tiktoken 2>/dev/null || \
+pip3 install --quiet httpx beautifulsoup4 lxml python-frontmatter tiktoken 2>/dev/null || \
 { echo "⚠️  Could not auto-install Python packages. Run manually:"; \
-  echo "   pip install httpx beautifulsoup4 python-frontmatter tiktoken"; }
+  echo "   pip install httpx beautifulsoup4 lxml python-frontmatter tiktoken"; }
 
 # 3. Create knowledge base directory structure
 echo "→ Setting up knowledge base..."
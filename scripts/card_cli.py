@@ -19,7 +19,11 @@ Knowledge management commands (called by the /knowledge command):
 Each command prints its result to stdout. Exit code 0 = success, 1 = error.
 """
 
+import hashlib
+import os
 import sys
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
 # Add the scripts directory to the import path so we can import knowledge.py
@@ -28,8 +32,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from knowledge import (
     KNOWLEDGE_CARDS_DIR,
+    TOKENIZER_ENCODING,
     count_tokens,
-    find_card_in_index,
+    entry_keywords_lc,
     find_duplicates,
     load_index,
     read_card,
@@ -39,6 +44,29 @@ from knowledge import (
     rebuild_index,
 )
 
+# count-tokens results, one small file per text (named by its SHA-1).
+# The distiller re-counts the same drafts across many separate CLI
+# calls, and loading the tokenizer dominates each one.
+TOKEN_CACHE_DIR = Path.home() / ".cache" / "feedfwd" / "tokcount"
+
+# The cache keeps at most this many counts; the least recently used
+# ones are pruned whenever a new count is added.
+TOKEN_CACHE_MAX_ENTRIES = 256
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _write_lines(lines: list[str]) -> None:
+    """Print a block of output lines with a single write.
+
+    Listing commands can produce hundreds of lines, and the /knowledge
+    command reads them through a pipe — one write is much cheaper than
+    a print() per line.
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
 def cmd_check_dup(args: list[str]) -> int:
     """Check if a proposed card would be a duplicate.
@@ -88,11 +116,50 @@ def cmd_count_tokens(args: list[str]) -> int:
         return 1
 
     text = " ".join(args)
+    key = hashlib.sha1(f"{TOKENIZER_ENCODING}\0{text}".encode()).hexdigest()
+    cache_path = TOKEN_CACHE_DIR / key
+    try:
+        cached = int(cache_path.read_text())
+    except (OSError, ValueError):
+        cached = None
+    if cached is not None:
+        try:
+            cache_path.touch()  # Mark as recently used (see _prune_token_cache)
+        except OSError:
+            pass  # Cache is best-effort
+        print(cached)
+        return 0
+
     tokens = count_tokens(text)
+    try:
+        TOKEN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(str(tokens))
+        _prune_token_cache()
+    except OSError:
+        pass  # Cache is best-effort
     print(tokens)
     return 0
 
 
+def _prune_token_cache() -> None:
+    """Delete the least recently used counts beyond TOKEN_CACHE_MAX_ENTRIES.
+
+    Every distinct draft adds a file, so without this the cache would
+    grow forever. Only called after a cache miss, which has just paid
+    for loading the tokenizer — listing one small directory is noise
+    next to that.
+    """
+    entries = list(os.scandir(TOKEN_CACHE_DIR))
+    if len(entries) <= TOKEN_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime_ns)
+    for entry in entries[:-TOKEN_CACHE_MAX_ENTRIES]:
+        try:
+            os.unlink(entry.path)
+        except FileNotFoundError:
+            pass  # Pruned by a concurrent call
+
+
 def cmd_index_add(args: list[str]) -> int:
     """Add a card to _index.json by reading its .md file.
 
@@ -140,9 +207,12 @@ def cmd_index_remove(args: list[str]) -> int:
 def cmd_index_rebuild(args: list[str]) -> int:
     """Rebuild _index.json from all .md files on disk.
 
-    Usage: card_cli.py index-rebuild
+    Usage: card_cli.py index-rebuild [--incremental]
+
+    With --incremental, only cards changed since the last rebuild are
+    re-read.
     """
-    index = rebuild_index()
+    index = rebuild_index(incremental="--incremental" in args)
     print(f"REBUILT: {len(index['cards'])} cards indexed")
     return 0
 
@@ -157,9 +227,12 @@ def cmd_index_list(args: list[str]) -> int:
         print("(empty — no cards yet)")
         return 0
 
-    for entry in index["cards"]:
-        print(f"  {entry['name']} → {entry['file']} (score: {entry['score']})")
-    print(f"\nTotal: {len(index['cards'])} cards")
+    out = [
+        f"  {entry['name']} → {entry['file']} (score: {entry['score']})"
+        for entry in index["cards"].values()
+    ]
+    out.append(f"\nTotal: {len(index['cards'])} cards")
+    _write_lines(out)
     return 0
 
 
@@ -171,30 +244,22 @@ def cmd_list(args: list[str]) -> int:
     Produces formatted output matching the spec's /knowledge display.
     """
     index = load_index()
-    cards = index["cards"]
+    cards = list(index["cards"].values())
 
     if not cards:
         print("📚 FeedFwd Knowledge Base (0 cards)")
         print("\n  No cards yet. Run /learn <url> to capture your first one.")
         return 0
 
-    # Group cards by category
-    by_category: dict[str, list[dict]] = {}
-    for card in cards:
-        cat = card["category"]
-        by_category.setdefault(cat, []).append(card)
+    # One sort puts categories in alphabetical order and each category's
+    # cards by score (highest first); groupby then splits the blocks
+    ordered = sorted(cards, key=lambda c: (c["category"], -c["score"]))
 
-    # Sort each category's cards by score (highest first)
-    for cat in by_category:
-        by_category[cat].sort(key=lambda c: c["score"], reverse=True)
+    out = [f"📚 FeedFwd Knowledge Base ({len(cards)} cards)", ""]
 
-    print(f"📚 FeedFwd Knowledge Base ({len(cards)} cards)")
-    print()
-
-    # Print each category, sorted alphabetically
-    for cat in sorted(by_category.keys()):
-        cat_cards = by_category[cat]
-        print(f"{cat}/ ({len(cat_cards)} cards)")
+    for cat, group in groupby(ordered, key=itemgetter("category")):
+        cat_cards = list(group)
+        out.append(f"{cat}/ ({len(cat_cards)} cards)")
         for c in cat_cards:
             surfaced = c["times_surfaced"]
             useful = c["times_useful"]
@@ -202,9 +267,10 @@ def cmd_list(args: list[str]) -> int:
                 status = "new — not yet surfaced"
             else:
                 status = f"surfaced {surfaced}x, useful {useful}x"
-            print(f"  ★ {c['score']:.2f}  {c['name']:<35s} ({status})")
-        print()
+            out.append(f"  ★ {c['score']:.2f}  {c['name']:<35s} ({status})")
+        out.append("")
 
+    _write_lines(out)
     return 0
 
 
@@ -221,26 +287,45 @@ def cmd_search(args: list[str]) -> int:
         return 1
 
     term = " ".join(args).lower()
-    index = load_index()
-    matches = []
+    cards = list(load_index()["cards"].values())
 
-    for card in index["cards"]:
-        # Search in name, category, and keywords
+    # Search in name, category, and keywords
+    match_types: list[str | None] = []
+    for card in cards:
         searchable = (
             card["name"].lower()
             + " " + card["category"].lower()
-            + " " + " ".join(kw.lower() for kw in card.get("keywords", []))
+            + " " + " ".join(entry_keywords_lc(card))
         )
-        if term in searchable:
-            matches.append((card, "metadata"))
-            continue
-
-        # If not found in metadata, search in the actual file content
-        card_path = KNOWLEDGE_CARDS_DIR / card["file"]
-        if card_path.exists():
-            content = card_path.read_text().lower()
-            if term in content:
-                matches.append((card, "content"))
+        match_types.append("metadata" if term in searchable else None)
+
+    # If not found in metadata, search in the actual file content.
+    # Each card is a separate file, so the reads are overlapped on a
+    # thread pool instead of waiting on the disk one file at a time.
+    def content_matches(card: dict) -> bool:
+        try:
+            content = (KNOWLEDGE_CARDS_DIR / card["file"]).read_text()
+        except FileNotFoundError:
+            return False
+        return term in content.lower()
+
+    unmatched = [pos for pos, match_type in enumerate(match_types) if match_type is None]
+    if unmatched:
+        # Imported here — only search needs it, and every CLI call is a
+        # fresh process that would otherwise pay for it
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            found = pool.map(content_matches, [cards[pos] for pos in unmatched])
+            for pos, hit in zip(unmatched, found):
+                if hit:
+                    match_types[pos] = "content"
+
+    matches = [
+        (card, match_type)
+        for card, match_type in zip(cards, match_types)
+        if match_type is not None
+    ]
 
     if not matches:
         print(f"No cards matching '{term}'")
@@ -266,12 +351,12 @@ def cmd_show(args: list[str]) -> int:
         return 1
 
     name = args[0]
-    entry = find_card_in_index(name)
+    index = load_index()
+    entry = index["cards"].get(name)
     if entry is None:
         print(f"Card not found: '{name}'")
         # Suggest similar names
-        index = load_index()
-        suggestions = [c["name"] for c in index["cards"] if name.lower() in c["name"].lower()]
+        suggestions = [n for n in index["cards"] if name.lower() in n.lower()]
         if suggestions:
             print(f"Did you mean: {', '.join(suggestions)}?")
         return 1
@@ -330,7 +415,7 @@ def cmd_stats(args: list[str]) -> int:
     low performers.
     """
     index = load_index()
-    cards = index["cards"]
+    cards = list(index["cards"].values())
 
     if not cards:
         print("📊 FeedFwd Stats")
@@ -345,31 +430,34 @@ def cmd_stats(args: list[str]) -> int:
     # Sort by score for top/low performers
     sorted_cards = sorted(cards, key=lambda c: c["score"], reverse=True)
 
-    print("📊 FeedFwd Stats")
-    print(f"Total cards: {len(cards)}")
-    print(f"Active (score > 0.3): {len(active)}")
-    print(f"Average score: {avg_score:.2f}")
+    out = [
+        "📊 FeedFwd Stats",
+        f"Total cards: {len(cards)}",
+        f"Active (score > 0.3): {len(active)}",
+        f"Average score: {avg_score:.2f}",
+    ]
 
     # Top performers (up to 3)
     top = sorted_cards[:3]
     if top:
-        print()
-        print("Top performers:")
+        out.append("")
+        out.append("Top performers:")
         for c in top:
             surfaced = c["times_surfaced"]
             useful = c["times_useful"]
-            print(f"  ★ {c['score']:.2f}  {c['name']:<35s} ({surfaced} sessions, {useful} useful)")
+            out.append(f"  ★ {c['score']:.2f}  {c['name']:<35s} ({surfaced} sessions, {useful} useful)")
 
     # Low performers (score <= 0.3, up to 3)
     low = [c for c in sorted_cards if c["score"] <= 0.3]
     if low:
-        print()
-        print("Low performers (consider removing):")
+        out.append("")
+        out.append("Low performers (consider removing):")
         for c in low[:3]:
             surfaced = c["times_surfaced"]
             useful = c["times_useful"]
-            print(f"  ★ {c['score']:.2f}  {c['name']:<35s} ({surfaced} sessions, {useful} useful)")
+            out.append(f"  ★ {c['score']:.2f}  {c['name']:<35s} ({surfaced} sessions, {useful} useful)")
 
+    _write_lines(out)
     return 0
 
 
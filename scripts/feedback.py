@@ -39,17 +39,26 @@ Usage:
 
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
+try:
+    import ahocorasick  # Optional (pyahocorasick) — see DiffScan
+except ImportError:
+    ahocorasick = None
+
 # Add scripts directory to path for knowledge module import
 sys.path.insert(0, str(Path(__file__).parent))
 
 from knowledge import (
     load_session_log,
     save_session_log,
-    update_card_score,
-    increment_useful,
-    find_card_in_index,
+    batch_update_scores,
+    load_index,
+    entry_keywords_lc,
     _empty_session_log,
 )
 
@@ -61,6 +70,15 @@ MODERATE_SIGNAL_DELTA = +0.05  # Session type matches OR keywords in diff
 IGNORED_DELTA = -0.02          # Neither matches — gentle decay
 IMPLICIT_SCORE_CAP = 0.70     # Max score reachable via implicit feedback
 
+# Delta for each signal combination, indexed by
+# (session_match << 1) | keyword_match — see compute_delta()
+_DELTA_TABLE = (
+    IGNORED_DELTA,          # neither
+    MODERATE_SIGNAL_DELTA,  # keyword match only
+    MODERATE_SIGNAL_DELTA,  # session match only
+    STRONG_SIGNAL_DELTA,    # both
+)
+
 # ---------------------------------------------------------------------------
 # Session type detection
 # ---------------------------------------------------------------------------
@@ -71,6 +89,14 @@ PLANNING_CATEGORIES = {"workflow", "prompting"}
 # Categories that benefit from code-type sessions
 CODE_CATEGORIES = {"python", "tools", "testing", "debugging", "architecture"}
 
+# Categories that match each session type. None = every category
+# (mixed sessions give everything a fair shot).
+MATCHING_CATS: dict[str, frozenset[str] | None] = {
+    "planning": frozenset(PLANNING_CATEGORIES),
+    "code": frozenset(CODE_CATEGORIES),
+    "mixed": None,
+}
+
 # File extensions that indicate planning/documentation work
 PLANNING_EXTENSIONS = {".md", ".txt", ".rst", ".doc", ".adoc"}
 
@@ -82,36 +108,185 @@ CODE_EXTENSIONS = {
     ".toml", ".cfg", ".ini", ".html", ".css", ".scss",
 }
 
+# Both extension sets folded into one lookup table, so classifying a file
+# is a single dict lookup: 0 = planning, 1 = code.
+EXT_KIND = {ext: 0 for ext in PLANNING_EXTENSIONS} | {ext: 1 for ext in CODE_EXTENSIONS}
+
+# Fallback markers, used when none of the changed files have a known
+# extension. "### " headings are covered by "## " (it's a substring).
+# Bytes, like the diff text they're searched in (see DiffScan).
+CODE_MARKERS = (b"def ", b"function ", b"import ")
+PLANNING_MARKERS = (b"## ",)
+
+# ---------------------------------------------------------------------------
+# Diff streaming
+# ---------------------------------------------------------------------------
+
+# Git diff output is scanned in batches of roughly this many bytes
+# instead of being collected into one big string first.
+DIFF_CHUNK_BYTES = 64 * 1024
+
+# `git diff` options for the session diff: --raw for the file list,
+# -p for the patch. --no-color and --no-ext-diff keep user config
+# (color.diff=always, an external diff tool) from adding escape codes
+# or routing every file through another program.
+DIFF_ARGS = ["diff", "--raw", "-p", "--no-color", "--no-ext-diff"]
+
+# With pyahocorasick installed, keyword sets at least this large are
+# matched in a single pass over each chunk. Below this, one `in` check
+# per keyword is just as fast.
+AHOCORASICK_MIN_KEYWORDS = 16
+
+# Time allowed for scanning the session diff, in seconds. If the diff
+# against the starting commit fails and we retry against HEAD, both
+# attempts share this budget.
+DIFF_TIMEOUT = 5.0
+
+# Stop reading a diff after this many bytes. Sessions that touch
+# huge generated or vendored files would otherwise dominate the hook's
+# runtime, and keywords buried that deep are noise anyway.
+MAX_DIFF_BYTES = 5_000_000
+
+
+class DiffScan:
+    """Running results of scanning the session diff, chunk by chunk.
+
+    Instead of building one giant lowercased string of the whole diff
+    and searching it afterwards, diff text is fed through here as it is
+    read. Each chunk is lowercased, checked for keywords and session-type
+    markers, and then thrown away — so memory use stays flat no matter
+    how large the diff is.
+
+    Chunks are raw bytes, exactly as git wrote them. Matching never needs
+    them decoded: the keywords are UTF-8 encoded once instead, and
+    bytes.lower() folds ASCII case without building a decoded copy of the
+    whole diff first. (Non-ASCII letters aren't case-folded, which only
+    matters for keywords like "Ünïcode" written in a different case.)
+
+    Keywords drop out of `pending` as soon as they are seen, so later
+    chunks only pay for the ones still missing. Once nothing is left to
+    find (see `complete`), callers can stop reading altogether.
+
+    When pyahocorasick is available and many keywords are pending, they
+    are compiled into one Aho-Corasick automaton, which finds all of
+    them in a single pass over the chunk.
+    """
+
+    def __init__(self, keywords: set[str]):
+        self.pending = set(keywords)      # lowercased keywords not seen yet
+        self.found: set[str] = set()      # keywords seen so far
+        self._needles = {kw: kw.encode() for kw in keywords}
+        self.code_markers = False         # saw "def ", "import ", etc.
+        self.planning_markers = False     # saw markdown headings
+        self.markers_needed = True        # False once file types decide the session type
+        self.bytes_scanned = 0
+        self._automaton = None
+        self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        """(Re)build the Aho-Corasick automaton over the pending keywords."""
+        self._automaton = None
+        # The automaton can't hold an empty keyword, so leave that case
+        # to the plain `in` checks
+        if ahocorasick is None or len(self.pending) < AHOCORASICK_MIN_KEYWORDS or "" in self.pending:
+            return
+        automaton = ahocorasick.Automaton()
+        for kw in self.pending:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    @property
+    def complete(self) -> bool:
+        """True when scanning more text can't change the result."""
+        if self.pending:
+            return False
+        if not self.markers_needed:
+            return True
+        return self.code_markers and self.planning_markers
+
+    def feed(self, text: bytes) -> None:
+        """Scan one chunk of diff text.
+
+        Chunks must end on a line boundary — keywords and markers never
+        contain newlines, so nothing can be split across two chunks.
+        """
+        if not text:
+            return
+        text = text.lower()
+        self.bytes_scanned += len(text)
+        if self.pending:
+            if self._automaton is not None:
+                # The automaton works on str, so only this path decodes
+                decoded = text.decode(errors="replace")
+                hits = {kw for _, kw in self._automaton.iter(decoded)}
+            else:
+                needles = self._needles
+                hits = {kw for kw in self.pending if needles[kw] in text}
+            if hits:
+                self.found |= hits
+                self.pending -= hits
+                if self._automaton is not None:
+                    # Stop matching keywords we've already found
+                    self._build_automaton()
+        if not self.markers_needed:
+            return
+        # Markers only need to be found once — skip the check afterwards
+        if not self.code_markers:
+            self.code_markers = any(m in text for m in CODE_MARKERS)
+        if not self.planning_markers:
+            self.planning_markers = any(m in text for m in PLANNING_MARKERS)
+
+    def merge(self, other: "DiffScan") -> None:
+        """Fold another scan's results into this one."""
+        self.found |= other.found
+        self.pending -= other.found
+        self.markers_needed = self.markers_needed and other.markers_needed
+        self.code_markers = self.code_markers or other.code_markers
+        self.planning_markers = self.planning_markers or other.planning_markers
+        self.bytes_scanned += other.bytes_scanned
+
+
+def _file_kind(filepath: str) -> int | None:
+    """Return 0 for a planning file, 1 for a code file, None otherwise (see EXT_KIND).
+
+    Sessions can touch thousands of files, so we slice the extension off
+    the string directly instead of building a Path object per file.
+    """
+    dot = filepath.rfind(".")
+    # A dot at the start of the filename is a dotfile (".env"), not an extension
+    if dot > filepath.rfind("/") + 1:
+        return EXT_KIND.get(filepath[dot:].lower())
+    return None
+
 
-def detect_session_type(diff_text: str, changed_files: list[str]) -> str:
+def detect_session_type(scan: DiffScan, changed_files: list[str]) -> str:
     """Detect whether this was a planning, code, or mixed session.
 
     Looks at which file types were changed during the session.
     More .md files → planning. More code files → code. Roughly equal → mixed.
 
     Args:
-        diff_text: The full git diff text.
+        scan: Results of scanning the session diff (see DiffScan).
         changed_files: List of file paths that were changed/created.
 
     Returns:
         "planning", "code", or "mixed"
     """
-    planning_count = 0
-    code_count = 0
-
+    # counts[0] = planning files, counts[1] = code files
+    counts = [0, 0]
     for filepath in changed_files:
-        ext = Path(filepath).suffix.lower()
-        if ext in PLANNING_EXTENSIONS:
-            planning_count += 1
-        elif ext in CODE_EXTENSIONS:
-            code_count += 1
+        kind = _file_kind(filepath)
+        if kind is not None:
+            counts[kind] += 1
+    planning_count, code_count = counts
 
     # If no files detected, try to infer from diff content
     if planning_count == 0 and code_count == 0:
         # Look for common markers in the diff text
-        if "def " in diff_text or "function " in diff_text or "import " in diff_text:
+        if scan.code_markers:
             code_count += 1
-        if "## " in diff_text or "### " in diff_text:
+        if scan.planning_markers:
             planning_count += 1
 
     total = planning_count + code_count
@@ -128,214 +303,259 @@ def detect_session_type(diff_text: str, changed_files: list[str]) -> str:
         return "mixed"
 
 
-def get_changed_files(project_dir: str | None, git_head: str | None, session_started_at: str | None = None) -> list[str]:
-    """Get list of files changed during this session.
-
-    Includes tracked changes (modified, added) and new untracked files
-    created after the session started.
+def _run_git(args: list[str], project_dir: str, timeout: float) -> str:
+    """Run a git command in project_dir and return its stdout.
 
-    Returns:
-        List of relative file paths.
+    Returns "" if git isn't installed, the command times out, or it
+    exits non-zero (e.g., not a git repo) — feedback is best-effort.
     """
-    if not project_dir:
-        return []
-
-    files = []
-
-    # Changed tracked files (staged + unstaged)
     try:
         result = subprocess.run(
-            ["git", "diff", "--name-only", "HEAD"],
+            ["git", *args],
             cwd=project_dir,
             capture_output=True,
             text=True,
-            timeout=5,
+            timeout=timeout,
         )
-        if result.returncode == 0 and result.stdout.strip():
-            files.extend(result.stdout.strip().split("\n"))
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        return ""
+    if result.returncode != 0:
+        return ""
+    return result.stdout
 
-    # Committed changes since session start
-    if git_head:
-        try:
-            result = subprocess.run(
-                ["git", "diff", "--name-only", git_head, "HEAD"],
-                cwd=project_dir,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                files.extend(result.stdout.strip().split("\n"))
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-
-    # New untracked files (filtered by session start time)
-    session_start_ts = 0.0
-    if session_started_at:
-        try:
-            from datetime import datetime, timezone
-            dt = datetime.fromisoformat(session_started_at)
-            session_start_ts = dt.timestamp()
-        except (ValueError, TypeError):
-            pass
 
-    try:
-        result = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
-            cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            for rel_path in result.stdout.strip().split("\n"):
-                full_path = Path(project_dir) / rel_path
-                if not full_path.exists():
-                    continue
-                if session_start_ts and full_path.stat().st_mtime < session_start_ts:
-                    continue
-                files.append(rel_path)
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+def _scan_git_diff(
+    args: list[str],
+    project_dir: str,
+    keywords: set[str],
+    timeout: float,
+) -> tuple[list[str], DiffScan] | None:
+    """Stream `git diff --raw -p ...` output (see DIFF_ARGS) through a DiffScan.
 
-    return list(set(files))  # Deduplicate
+    With --raw, git first prints one ":<modes> <shas> <status>\t<path>"
+    line per changed file, then the normal patch. So a single git call
+    gives us both the changed-file list and the diff content.
 
+    The output is read line by line and scanned in DIFF_CHUNK_BYTES
+    batches as it arrives, rather than waiting for git to finish and
+    holding the entire diff in memory. Reading stops early once the
+    scan is complete — every keyword found, and the session type settled
+    either by the changed files or by both kinds of marker.
 
-def get_session_diff(project_dir: str | None, git_head: str | None, session_started_at: str | None = None) -> str:
-    """Get the combined git diff text since session start.
-
-    Includes tracked changes, untracked file content, committed changes,
-    and commit messages. All lowercased for keyword matching.
+    Returns:
+        (changed_files, scan), or None if git failed or timed out.
     """
-    if not project_dir:
-        return ""
-
-    diff_parts = []
-
-    # Uncommitted changes to tracked files
     try:
-        result = subprocess.run(
-            ["git", "diff", "HEAD"],
+        proc = subprocess.Popen(
+            ["git", *args],
             cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=5,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
-        if result.returncode == 0 and result.stdout.strip():
-            diff_parts.append(result.stdout)
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+    except FileNotFoundError:
+        return None
 
-    # New untracked files created during session
-    session_start_ts = 0.0
-    if session_started_at:
-        try:
-            from datetime import datetime, timezone
-            dt = datetime.fromisoformat(session_started_at)
-            session_start_ts = dt.timestamp()
-        except (ValueError, TypeError):
-            pass
+    # Kill git if it runs past the timeout — the read loop below then
+    # sees end-of-file and we report the whole call as failed.
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+
+    files: list[str] = []
+    scan = DiffScan(keywords)
+    batch: list[bytes] = []
+    batch_bytes = 0
+    stopped_early = False
 
     try:
-        result = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
-            cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            for rel_path in result.stdout.strip().split("\n"):
-                full_path = Path(project_dir) / rel_path
-                if not full_path.exists() or full_path.stat().st_size > 50_000:
-                    continue
-                if session_start_ts and full_path.stat().st_mtime < session_start_ts:
-                    continue
-                try:
-                    diff_parts.append(full_path.read_text())
-                except Exception:
-                    pass
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        with proc:
+            lines = iter(proc.stdout)
+            for line in lines:
+                if not line.startswith(b":"):
+                    batch.append(line)
+                    batch_bytes = len(line)
+                    break
+                # Renames/copies list "old\tnew" — the last field is the current path
+                path = line.rstrip(b"\n").rsplit(b"\t", 1)[-1]
+                files.append(path.decode(errors="replace"))
+
+            # Classifiable files make the content markers irrelevant
+            # (detect_session_type only falls back to them with no files)
+            if any(_file_kind(f) is not None for f in files):
+                scan.markers_needed = False
+
+            for line in lines:
+                batch.append(line)
+                batch_bytes += len(line)
+                if batch_bytes >= DIFF_CHUNK_BYTES:
+                    scan.feed(b"".join(batch))
+                    batch.clear()
+                    batch_bytes = 0
+                    if scan.complete or scan.bytes_scanned >= MAX_DIFF_BYTES:
+                        stopped_early = True
+                        proc.kill()
+                        break
+            scan.feed(b"".join(batch))
+    finally:
+        timer.cancel()
+
+    if proc.returncode != 0 and not stopped_early:
+        return None
+    return files, scan
+
+
+def _parse_ts(value: str | None) -> float:
+    """Convert an ISO timestamp from the session log to a Unix timestamp.
+
+    Returns 0.0 if the value is missing or malformed.
+    """
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def collect_git_state(
+    project_dir: str | None,
+    git_head: str | None,
+    session_start_ts: float = 0.0,
+    keywords: set[str] | None = None,
+) -> tuple[DiffScan, list[str]]:
+    """Scan everything that changed during the session.
+
+    Covers tracked changes (staged + unstaged), new untracked files
+    created after the session started, commits made during the session,
+    and their commit messages.
+
+    Each git command is a separate process, and most of the wall-clock
+    time is spent waiting on them. We start them all at once on a thread
+    pool instead of one after another. The untracked-file listing is
+    shared between the diff scan and the file list rather than being run
+    twice.
+
+    When we know the session's starting commit, a single
+    `git diff <git_head>` (working tree against that commit) covers both
+    the commits made during the session and the uncommitted changes on
+    top of them, so one process does the work of two.
 
-    # Committed changes since session start
-    if git_head:
-        try:
-            result = subprocess.run(
-                ["git", "diff", git_head, "HEAD"],
-                cwd=project_dir,
-                capture_output=True,
-                text=True,
-                timeout=5,
+    Args:
+        session_start_ts: Session start as a Unix timestamp (0 = unknown).
+            Untracked files older than this are ignored.
+        keywords: Lowercased keywords to look for while scanning.
+
+    Returns:
+        (scan, changed_files) — scan holds which keywords and session-type
+        markers appeared; changed_files are relative paths, deduplicated.
+    """
+    keywords = keywords or set()
+    scan = DiffScan(keywords)
+    if not project_dir:
+        return scan, []
+
+    deadline = time.monotonic() + DIFF_TIMEOUT
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        # Changes to tracked files since session start: committed, staged
+        # and unstaged. Without a starting commit, just the uncommitted ones.
+        diff = pool.submit(
+            _scan_git_diff,
+            [*DIFF_ARGS, git_head or "HEAD"],
+            project_dir,
+            keywords,
+            DIFF_TIMEOUT,
+        )
+        # New untracked files (filtered by session start time below).
+        # -z gives NUL-separated, unquoted paths, so names with spaces or
+        # non-ASCII characters come through exactly as they are on disk.
+        untracked = pool.submit(
+            _run_git, ["ls-files", "--others", "--exclude-standard", "-z"], project_dir, 5
+        )
+        # Commit messages since session start
+        log = None
+        if git_head:
+            log = pool.submit(
+                _run_git, ["log", "--oneline", f"{git_head}..HEAD"], project_dir, 3
             )
-            if result.returncode == 0 and result.stdout.strip():
-                diff_parts.append(result.stdout)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
 
-    # Commit messages since session start
-    if git_head:
+    files = []
+
+    result = diff.result()
+    remaining = deadline - time.monotonic()
+    if result is None and git_head and remaining > 0:
+        # The starting commit may be gone (rebased away, shallow clone).
+        # Still pick up the uncommitted changes, in whatever time the
+        # first attempt left.
+        result = _scan_git_diff([*DIFF_ARGS, "HEAD"], project_dir, keywords, remaining)
+    if result is not None:
+        diff_files, diff_scan = result
+        files.extend(diff_files)
+        scan.merge(diff_scan)
+
+    for rel_path in untracked.result().split("\0"):
+        if not rel_path:
+            continue
+        full_path = Path(project_dir) / rel_path
         try:
-            result = subprocess.run(
-                ["git", "log", "--oneline", f"{git_head}..HEAD"],
-                cwd=project_dir,
-                capture_output=True,
-                text=True,
-                timeout=3,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                diff_parts.append(result.stdout)
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+            stat = full_path.stat()
+        except OSError:
+            continue
+        if session_start_ts and stat.st_mtime < session_start_ts:
+            continue
+        files.append(rel_path)
+        # Include the content of small new files in the scan, unless
+        # there is nothing left to look for
+        if stat.st_size <= 50_000 and not scan.complete:
+            try:
+                scan.feed(full_path.read_bytes())
+            except Exception:
+                pass
 
-    return "\n".join(diff_parts).lower()
+    if log is not None and not scan.complete:
+        scan.feed(log.result().encode())
 
+    return scan, list(dict.fromkeys(files))  # Deduplicate, keeping git's order
 
-def check_card_keywords(card_name: str, diff_text: str) -> bool:
+
+def check_card_keywords(entry: dict, found_keywords: set[str]) -> bool:
     """Check if a card's keywords appear in the session diff.
 
     Requires at least 2 keyword matches (or 1 if fewer than 3 keywords)
     to avoid false positives from common words.
-    """
-    if not diff_text:
-        return False
 
-    entry = find_card_in_index(card_name)
-    if entry is None:
+    Args:
+        entry: The card's index entry.
+        found_keywords: Keywords present in the diff (DiffScan.found).
+    """
+    if not found_keywords:
         return False
 
-    keywords = entry.get("keywords", [])
+    keywords = entry_keywords_lc(entry)
     if not keywords:
         return False
 
-    hits = sum(1 for kw in keywords if kw.lower() in diff_text)
+    # The diff was already scanned once for every card's keywords, so
+    # each check here is a set lookup. Stop as soon as we have enough.
     min_hits = min(2, len(keywords))
-    return hits >= min_hits
+    hits = 0
+    for kw in keywords:
+        if kw in found_keywords:
+            hits += 1
+            if hits >= min_hits:
+                return True
+    return False
 
 
-def check_session_type_match(card_name: str, session_type: str) -> bool:
+def check_session_type_match(entry: dict, session_type: str) -> bool:
     """Check if a card's category aligns with the detected session type.
 
     Planning sessions match workflow/prompting cards.
     Code sessions match python/tools/testing/debugging/architecture cards.
     Mixed sessions match everything.
     """
-    entry = find_card_in_index(card_name)
-    if entry is None:
+    if session_type not in MATCHING_CATS:
         return False
-
-    category = entry.get("category", "")
-
-    if session_type == "mixed":
-        return True  # Everything gets a fair shot in mixed sessions
-    elif session_type == "planning":
-        return category in PLANNING_CATEGORIES
-    elif session_type == "code":
-        return category in CODE_CATEGORIES
-
-    return False
+    cats = MATCHING_CATS[session_type]
+    return cats is None or entry.get("category", "") in cats
 
 
 def compute_delta(session_match: bool, keyword_match: bool, current_score: float) -> float:
@@ -350,12 +570,7 @@ def compute_delta(session_match: bool, keyword_match: bool, current_score: float
     Applies the implicit boost cap: score can't exceed 0.70 from
     implicit feedback alone.
     """
-    if session_match and keyword_match:
-        delta = STRONG_SIGNAL_DELTA
-    elif session_match or keyword_match:
-        delta = MODERATE_SIGNAL_DELTA
-    else:
-        delta = IGNORED_DELTA
+    delta = _DELTA_TABLE[(bool(session_match) << 1) | bool(keyword_match)]
 
     # Apply boost cap — implicit feedback can't push score above 0.70
     if delta > 0 and current_score + delta > IMPLICIT_SCORE_CAP:
@@ -375,34 +590,48 @@ def main():
     # 2. Get session diff and changed files
     project_dir = log.get("project_dir")
     git_head = log.get("git_head_at_start")
-    started_at = log.get("started_at")
+    session_start_ts = _parse_ts(log.get("started_at"))
+
+    # Look up every injected card's index entry once, up front. Cards
+    # that were removed since injection are skipped.
+    by_name = load_index()["cards"]
+    entries = [by_name[name] for name in injected if name in by_name]
+
+    # Every keyword of every injected card is looked for in the same
+    # streaming pass over the diff, rather than once per card.
+    all_keywords = set()
+    for entry in entries:
+        all_keywords.update(entry_keywords_lc(entry))
 
-    diff_text = get_session_diff(project_dir, git_head, started_at)
-    changed_files = get_changed_files(project_dir, git_head, started_at)
+    scan, changed_files = collect_git_state(
+        project_dir, git_head, session_start_ts, all_keywords
+    )
 
     # 3. Detect session type
-    session_type = detect_session_type(diff_text, changed_files)
+    session_type = detect_session_type(scan, changed_files)
 
     # 4. Score each injected card
-    results = []  # (card_name, session_match, keyword_match, new_score)
-
-    for card_name in injected:
-        entry = find_card_in_index(card_name)
-        if entry is None:
-            continue
+    signals = []  # (card_name, session_match, keyword_match)
+    updates = []  # (card_name, delta, mark_useful)
 
-        session_match = check_session_type_match(card_name, session_type)
-        keyword_match = check_card_keywords(card_name, diff_text)
+    for entry in entries:
+        card_name = entry["name"]
+        session_match = check_session_type_match(entry, session_type)
+        keyword_match = check_card_keywords(entry, scan.found)
         current_score = entry.get("score", 0.5)
 
         delta = compute_delta(session_match, keyword_match, current_score)
 
-        if delta > 0:
-            increment_useful(card_name)
+        signals.append((card_name, session_match, keyword_match))
+        updates.append((card_name, delta, delta > 0))
 
-        new_score = update_card_score(card_name, delta)
-        if new_score is not None:
-            results.append((card_name, session_match, keyword_match, new_score))
+    # Write all score changes at once (one index save, not two per card)
+    new_scores = batch_update_scores(updates)
+    results = [  # (card_name, session_match, keyword_match, new_score)
+        (card_name, s_match, kw_match, new_scores[card_name])
+        for card_name, s_match, kw_match in signals
+        if card_name in new_scores
+    ]
 
     # 5. Output summary
     if results:
@@ -6,7 +6,9 @@ ads, sidebars, and other boilerplate.
 
 What it does:
   1. Fetches the page with httpx (handles redirects, timeouts)
-  2. Parses HTML with BeautifulSoup
+  2. Parses HTML with lxml (BeautifulSoup only as a fallback for
+     markup lxml can't handle). lxml is required — extraction works
+     on the lxml tree directly, so there is no lxml-free path.
   3. Extracts the main content using a priority-based strategy:
      - First looks for <article> tags (most blogs/news sites use this)
      - Then tries <main> tags
@@ -24,19 +26,25 @@ Usage:
   # Prints extracted text to stdout
 """
 
+import atexit
+import importlib.util
 import re
 import sys
+import threading
 
 import httpx
-from bs4 import BeautifulSoup, Tag
+from bs4.dammit import EncodingDetector
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.html import HtmlElement
 
 
 # Elements that never contain article content — we strip these first
 # to reduce noise before looking for the main content.
-NOISE_TAGS = [
+NOISE_TAGS = frozenset({
     "script", "style", "nav", "header", "footer", "aside",
     "iframe", "noscript", "svg", "form", "button",
-]
+})
 
 # CSS class/id patterns that typically indicate non-content sections.
 # We use these as a heuristic — not perfect, but catches most cases.
@@ -63,6 +71,29 @@ USER_AGENT = (
     "Chrome/120.0.0.0 Safari/537.36"
 )
 
+# One shared HTTP client, created on first use. Fetching several URLs in
+# the same process then reuses open connections instead of paying for a
+# new TCP + TLS handshake every time.
+_client: httpx.Client | None = None
+
+
+def _get_client() -> httpx.Client:
+    """Lazy-create the shared client (closed automatically at exit)."""
+    global _client
+    if _client is None:
+        # We follow redirects and set a reasonable timeout. The timeout
+        # has two parts: connect (how long to establish connection) and
+        # read (how long to wait for the response body). HTTP/2 needs the
+        # optional h2 package, so it's only enabled when that's installed.
+        _client = httpx.Client(
+            http2=importlib.util.find_spec("h2") is not None,
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+        atexit.register(_client.close)
+    return _client
+
 
 def fetch_and_extract(url: str) -> str:
     """Fetch a URL and extract the main article text.
@@ -83,29 +114,21 @@ def fetch_and_extract(url: str) -> str:
         httpx.HTTPStatusError: If the server returns 4xx/5xx.
         httpx.ConnectError: If the URL can't be reached.
     """
-    # Fetch the page. We follow redirects and set a reasonable timeout.
-    # The timeout has two parts: connect (how long to establish connection)
-    # and read (how long to wait for the response body).
-    response = httpx.get(
-        url,
-        headers={"User-Agent": USER_AGENT},
-        follow_redirects=True,
-        timeout=httpx.Timeout(30.0, connect=10.0),
-    )
+    # Fetch the page
+    response = _get_client().get(url)
     response.raise_for_status()
 
-    # Parse HTML
-    soup = BeautifulSoup(response.text, "html.parser")
+    root = _parse_html(response)
 
     # Step 1: Remove noise elements (scripts, nav, footer, etc.)
-    _strip_noise(soup)
+    _strip_noise(root)
 
     # Step 2: Try to find the main content using our priority strategy
     content = (
-        _try_tag(soup, "article")
-        or _try_tag(soup, "main")
-        or _try_content_class(soup)
-        or _fallback_body(soup)
+        _try_tag(root, "article")
+        or _try_tag(root, "main")
+        or _try_content_class(root)
+        or _fallback_body(root)
     )
 
     if not content:
@@ -115,45 +138,126 @@ def fetch_and_extract(url: str) -> str:
     return _clean_text(content)
 
 
-def _strip_noise(soup: BeautifulSoup) -> None:
+# HTML parsers, reused across fetches. One set per thread — lxml parser
+# objects must not be shared between threads.
+_parsers = threading.local()
+
+
+def _get_parser(encoding: str | None) -> lxml_html.HTMLParser:
+    """Return this thread's parser for the given charset (None = detect).
+
+    Comments and processing instructions never hold article text, so the
+    parser drops them instead of building nodes for them. A charset lxml
+    doesn't know (servers send things like "utf8mb4") gets the detecting
+    parser, which falls back on <meta charset> and byte sniffing.
+    """
+    cache = _parsers.__dict__.setdefault("by_encoding", {})
+    parser = cache.get(encoding)
+    if parser is None:
+        try:
+            parser = lxml_html.HTMLParser(
+                encoding=encoding, remove_comments=True, remove_pis=True
+            )
+        except LookupError:
+            parser = _get_parser(None)
+        cache[encoding] = parser
+    return parser
+
+
+def _page_encoding(response: httpx.Response) -> str | None:
+    """The charset to parse the page with (None = let lxml detect it).
+
+    The HTTP header charset wins. Without one, lxml can only be trusted
+    to detect the encoding when the page declares it (a byte order mark
+    or <meta charset>) — otherwise it guesses latin-1, which garbles
+    UTF-8 text. Undeclared pages are read as UTF-8 instead, same as
+    httpx's response.text.
+    """
+    if response.charset_encoding:
+        return response.charset_encoding
+    content = response.content
+    if EncodingDetector.strip_byte_order_mark(content)[1]:
+        return None
+    if EncodingDetector.find_declared_encoding(content, is_html=True):
+        return None
+    return "utf-8"
+
+
+def _parse_html(response: httpx.Response) -> HtmlElement:
+    """Parse the fetched page into an lxml element tree.
+
+    lxml builds the tree in C and we work on it directly — wrapping it
+    in BeautifulSoup objects would cost more than the parse itself. It
+    gets the raw bytes so it can honour <meta charset>, with the HTTP
+    header charset (if any) taking precedence.
+
+    If lxml rejects the document outright, we fall back to BeautifulSoup's
+    more forgiving html.parser, converted into the same kind of tree.
+    """
+    parser = _get_parser(_page_encoding(response))
+    try:
+        return lxml_html.document_fromstring(response.content, parser=parser)
+    except (etree.LxmlError, ValueError):
+        from lxml.html import soupparser
+        return soupparser.fromstring(response.text, features="html.parser")
+
+
+def _class_and_id(el: HtmlElement) -> str:
+    """An element's class and id attributes as one string.
+
+    Lets each pattern check be a single regex search per element rather
+    than one for the class and another for the id. The space keeps a match
+    from spanning the two (none of the patterns contain spaces).
+    """
+    return f"{el.get('class', '')} {el.get('id', '')}"
+
+
+def _strip_noise(root: HtmlElement) -> None:
     """Remove elements that never contain article content.
 
-    Modifies the soup in-place. We do this before searching for
+    Modifies the tree in-place. We do this before searching for
     content so noise doesn't pollute our results.
+
+    One pass over the tree handles both noise tags and noise class/id
+    names, instead of a separate search per tag name.
     """
-    # Remove noise tags entirely
-    for tag_name in NOISE_TAGS:
-        for tag in soup.find_all(tag_name):
-            tag.decompose()
-
-    # Remove elements with noise-related class/id names.
-    # We check tag.attrs is not None because decomposing a parent tag
-    # detaches its children, leaving them with attrs=None. If we
-    # encounter one of those orphaned children later in the loop,
-    # we skip it.
-    for tag in soup.find_all(True):
-        if tag.attrs is None:
+    # The element list is taken up front because we remove elements as
+    # we go. Elements inside an already-removed subtree may still come up
+    # in the list — removing them again is harmless.
+    for el in list(root.iter()):
+        # Skip comments and processing instructions (their tag isn't a str)
+        if not isinstance(el.tag, str):
             continue
-        classes = " ".join(tag.get("class", []))
-        tag_id = tag.get("id", "")
-        if NOISE_PATTERNS.search(classes) or NOISE_PATTERNS.search(tag_id):
-            tag.decompose()
+        if el.tag in NOISE_TAGS or NOISE_PATTERNS.search(_class_and_id(el)):
+            if el.getparent() is None:
+                el.clear()  # The root itself is noise — nothing left
+            else:
+                el.drop_tree()  # Removes the element but keeps its tail text
 
 
-def _try_tag(soup: BeautifulSoup, tag_name: str) -> str | None:
+def _try_tag(root: HtmlElement, tag_name: str) -> str | None:
     """Try to extract content from a specific HTML tag.
 
     If multiple tags are found (e.g., multiple <article> tags on a
     page), we pick the one with the most text content — that's
     usually the main article, not a sidebar teaser.
+
+    Text is extracted once per tag, and not at all for tags nested inside
+    another match (a nested <article> can't have more text than the one
+    around it).
     """
-    tags = soup.find_all(tag_name)
-    if not tags:
+    texts = []
+    seen: set[HtmlElement] = set()
+    for el in root.iter(tag_name):
+        seen.add(el)
+        if any(parent in seen for parent in el.iterancestors()):
+            continue
+        texts.append(el.text_content())
+    if not texts:
         return None
 
     # Pick the tag with the most text
-    best = max(tags, key=lambda t: len(t.get_text()))
-    text = best.get_text()
+    text = max(texts, key=len)
 
     # Only accept if there's meaningful content (not just a wrapper)
     if len(text.strip()) > 200:
@@ -162,19 +266,26 @@ def _try_tag(soup: BeautifulSoup, tag_name: str) -> str | None:
     return None
 
 
-def _try_content_class(soup: BeautifulSoup) -> str | None:
+def _try_content_class(root: HtmlElement) -> str | None:
     """Try to find content by CSS class/id name patterns.
 
     Many sites use classes like "post-content", "entry-content",
     "article-body", etc. We look for divs matching these patterns.
+
+    Matches are often nested ("post" wrapping "post-body" wrapping
+    "entry-content"). An element's text includes all of its children's,
+    so a match inside another match can never be the longest — we skip
+    those instead of extracting the same text again at every level.
     """
     candidates = []
-
-    for tag in soup.find_all(["div", "section"]):
-        classes = " ".join(tag.get("class", []))
-        tag_id = tag.get("id", "")
-        if CONTENT_PATTERNS.search(classes) or CONTENT_PATTERNS.search(tag_id):
-            text = tag.get_text()
+    matched: set[HtmlElement] = set()
+
+    for el in root.iter("div", "section"):
+        if CONTENT_PATTERNS.search(_class_and_id(el)):
+            if any(parent in matched for parent in el.iterancestors()):
+                continue
+            matched.add(el)
+            text = el.text_content()
             if len(text.strip()) > 200:
                 candidates.append(text)
 
@@ -185,16 +296,16 @@ def _try_content_class(soup: BeautifulSoup) -> str | None:
     return None
 
 
-def _fallback_body(soup: BeautifulSoup) -> str | None:
+def _fallback_body(root: HtmlElement) -> str | None:
     """Last resort: grab text from <body> after noise removal.
 
     Since we already stripped noise elements in _strip_noise(),
     what's left in <body> should be mostly content. Not perfect,
     but better than nothing.
     """
-    body = soup.find("body")
-    if body:
-        text = body.get_text()
+    body = root.find(".//body")
+    if body is not None:
+        text = body.text_content()
         if len(text.strip()) > 200:
             return text
     return None
@@ -227,7 +338,9 @@ def _clean_text(raw_text: str) -> str:
 
     # Cap at ~10,000 words to avoid sending enormous content
     # to the distiller. Most articles are 1,000-3,000 words.
-    words = text.split()
+    # maxsplit stops splitting after the cap — anything past it comes
+    # back as one leftover string instead of thousands of word strings.
+    words = text.split(None, 10_000)
     if len(words) > 10_000:
         text = " ".join(words[:10_000]) + "\n\n[Content truncated at 10,000 words]"
 
@@ -26,10 +26,14 @@ Usage:
   python inject.py "$PROJECT_DIR"
 """
 
+import functools
+import os
+import re
 import subprocess
 import sys
+from collections.abc import Callable
 from datetime import datetime, timezone
-from fnmatch import fnmatch
+from fnmatch import translate
 from pathlib import Path
 
 # Add scripts directory to path for knowledge module import
@@ -39,11 +43,13 @@ from knowledge import (
     KNOWLEDGE_CARDS_DIR,
     MAX_CARDS_PER_SESSION,
     MAX_SESSION_TOKENS,
+    entry_keywords_lc,
     load_index,
     load_session_log,
     save_session_log,
     read_card,
     increment_surfaced,
+    index_transaction,
 )
 
 # Minimum relevance score to inject a card. Cards scoring below this
@@ -55,6 +61,38 @@ MIN_RELEVANCE = 0.2
 HEADER_TOKENS = 25
 
 
+@functools.lru_cache(maxsize=None)
+def _glob_matcher(pattern: str) -> Callable[[str], re.Match | None]:
+    """Compile a file glob like "*.py" once, into a regex match function.
+
+    Cards share a small set of patterns, so each one is translated once
+    per run instead of on every fnmatch() call.
+    """
+    return re.compile(translate(pattern)).match
+
+
+def _matching_patterns(patterns: set[str], context: dict) -> set[str]:
+    """Return the file patterns that match at least one project file.
+
+    A pattern matches if it fits one of the project's extensions
+    (e.g., "*.py" matches ".py") or one of its actual filenames.
+    """
+    candidates = [f"file{ext}" for ext in context["file_extensions"]]
+    candidates.extend(context["file_names"])
+    return {
+        pattern for pattern in patterns
+        if any(map(_glob_matcher(pattern), candidates))
+    }
+
+
+def _suffix(name: str) -> str:
+    """File extension of a bare filename — same result as Path(name).suffix."""
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ""
+
+
 def get_project_context(project_dir: Path) -> dict:
     """Gather signals about what this project is about.
 
@@ -67,11 +105,14 @@ def get_project_context(project_dir: Path) -> dict:
       - file_extensions: set of extensions like {".py", ".ts", ".md"}
       - file_names: set of filenames present (for matching file_patterns)
       - text_context: combined text from CLAUDE.md + git log (for keyword matching)
+      - git_head: full SHA of HEAD, or None if not a git repo (for the
+        session log — it comes out of the same git call as the log)
     """
     context = {
         "file_extensions": set(),
         "file_names": set(),
         "text_context": "",
+        "git_head": None,
     }
 
     if not project_dir.exists():
@@ -79,41 +120,54 @@ def get_project_context(project_dir: Path) -> dict:
 
     # 1. Scan file extensions and names (top 2 levels only — don't recurse into node_modules etc.)
     skip_dirs = {".git", ".venv", "node_modules", "__pycache__", ".claude-plugin", "venv", ".next", "dist", "build"}
-    for item in project_dir.iterdir():
-        if item.name.startswith(".") and item.name in skip_dirs:
-            continue
-        if item.is_file():
-            context["file_extensions"].add(item.suffix)
-            context["file_names"].add(item.name)
-        elif item.is_dir() and item.name not in skip_dirs:
-            try:
-                for sub_item in item.iterdir():
-                    if sub_item.is_file():
-                        context["file_extensions"].add(sub_item.suffix)
-                        context["file_names"].add(sub_item.name)
-            except PermissionError:
-                pass
+    # os.scandir hands back each entry's file type straight from the
+    # directory listing, so telling files from directories doesn't cost a
+    # stat() (or a Path object) per entry.
+    with os.scandir(project_dir) as items:
+        for item in items:
+            if item.name.startswith(".") and item.name in skip_dirs:
+                continue
+            if item.is_file():
+                context["file_extensions"].add(_suffix(item.name))
+                context["file_names"].add(item.name)
+            elif item.is_dir() and item.name not in skip_dirs:
+                try:
+                    with os.scandir(item.path) as sub_items:
+                        for sub_item in sub_items:
+                            if sub_item.is_file():
+                                context["file_extensions"].add(_suffix(sub_item.name))
+                                context["file_names"].add(sub_item.name)
+                except PermissionError:
+                    pass
 
     # 2. Read CLAUDE.md if it exists (contains project-specific instructions)
     text_parts = []
     claude_md = project_dir / "CLAUDE.md"
-    if claude_md.exists():
-        try:
-            text_parts.append(claude_md.read_text()[:2000])  # Cap at 2000 chars
-        except Exception:
-            pass
+    try:
+        # Cap at 2000 chars — read just that much rather than loading
+        # a long CLAUDE.md in full and slicing it. A missing file just
+        # fails the open, so there's no separate exists() check.
+        with claude_md.open() as f:
+            text_parts.append(f.read(2000))
+    except Exception:
+        pass
 
     # 3. Recent git log (last 5 commit messages — what has the dev been working on?)
+    # Each line is "<full sha> <short sha> <subject>". The short form is
+    # what `git log --oneline` shows; the full SHA of the first line is
+    # HEAD, which saves a separate `git rev-parse HEAD` call.
     try:
         result = subprocess.run(
-            ["git", "log", "--oneline", "-5", "--no-decorate"],
+            ["git", "log", "--format=%H %h %s", "-5"],
             cwd=project_dir,
             capture_output=True,
             text=True,
             timeout=3,
         )
         if result.returncode == 0 and result.stdout.strip():
-            text_parts.append(result.stdout.strip())
+            lines = result.stdout.strip().splitlines()
+            context["git_head"] = lines[0].split(" ", 1)[0]
+            text_parts.append("\n".join(line.split(" ", 1)[1] for line in lines))
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
 
@@ -122,7 +176,12 @@ def get_project_context(project_dir: Path) -> dict:
     return context
 
 
-def score_card(card_entry: dict, context: dict) -> float:
+def score_card(
+    card_entry: dict,
+    context: dict,
+    found_keywords: set[str] | None = None,
+    matched_patterns: set[str] | None = None,
+) -> float:
     """Score a card's relevance to the current project.
 
     Formula: relevance = keyword_overlap * 0.6 + card_score * 0.4
@@ -135,11 +194,17 @@ def score_card(card_entry: dict, context: dict) -> float:
     Args:
         card_entry: A card's index entry (from _index.json).
         context: Project context from get_project_context().
+        found_keywords: Lowercased keywords already known to appear in
+            the text context (see select_cards). If omitted, the card's
+            keywords are searched for directly.
+        matched_patterns: File patterns already known to match the
+            project's files (see select_cards). If omitted, the card's
+            patterns are matched directly.
 
     Returns:
         A relevance score between 0.0 and 1.0.
     """
-    keywords = card_entry.get("keywords", [])
+    keywords = entry_keywords_lc(card_entry)
     file_patterns = card_entry.get("file_patterns", [])
     task_types = card_entry.get("task_types", [])
     card_score = card_entry.get("score", 0.5)
@@ -150,32 +215,29 @@ def score_card(card_entry: dict, context: dict) -> float:
 
     # Signal 1: Keyword matches in text context
     # Check if each keyword appears in the combined text (CLAUDE.md + git log)
-    text = context["text_context"]
+    if found_keywords is None:
+        text = context["text_context"]
+        found_keywords = {kw for kw in keywords if kw in text}
     keyword_hits = 0
     for kw in keywords:
-        if kw.lower() in text:
+        if kw in found_keywords:
             keyword_hits += 1
 
+    if not keyword_hits and not file_patterns:
+        # No overlap signal at all — relevance is just the card's own score
+        return card_score * 0.4
+
     keyword_score = keyword_hits / len(keywords) if keywords else 0.0
 
     # Signal 2: File pattern matches
     # Check if the card's file_patterns match any files in the project
     pattern_hits = 0
     if file_patterns:
-        all_names = context["file_names"]
-        all_extensions = context["file_extensions"]
+        if matched_patterns is None:
+            matched_patterns = _matching_patterns(set(file_patterns), context)
         for pattern in file_patterns:
-            # Check against extensions (e.g., "*.py" matches ".py" extension)
-            for ext in all_extensions:
-                if fnmatch(f"file{ext}", pattern):
-                    pattern_hits += 1
-                    break
-            else:
-                # Check against actual filenames
-                for name in all_names:
-                    if fnmatch(name, pattern):
-                        pattern_hits += 1
-                        break
+            if pattern in matched_patterns:
+                pattern_hits += 1
 
         pattern_score = pattern_hits / len(file_patterns)
     else:
@@ -199,10 +261,23 @@ def select_cards(index: dict, context: dict) -> list[tuple[dict, float]]:
     Returns:
         List of (card_entry, relevance_score) tuples, sorted by relevance.
     """
+    # Cards share a lot of keywords ("python", "testing", ...) and file
+    # patterns ("*.py", ...), so check each distinct one against the
+    # project once, up front, rather than once per card that lists it
+    text = context["text_context"]
+    all_keywords = {
+        kw for card_entry in index["cards"].values() for kw in entry_keywords_lc(card_entry)
+    }
+    found_keywords = {kw for kw in all_keywords if kw in text}
+    all_patterns = {
+        pattern for card_entry in index["cards"].values() for pattern in card_entry.get("file_patterns", [])
+    }
+    matched_patterns = _matching_patterns(all_patterns, context)
+
     # Score all cards
     scored = []
-    for card_entry in index["cards"]:
-        relevance = score_card(card_entry, context)
+    for card_entry in index["cards"].values():
+        relevance = score_card(card_entry, context, found_keywords, matched_patterns)
         if relevance > MIN_RELEVANCE:
             scored.append((card_entry, relevance))
 
@@ -254,23 +329,6 @@ def format_injection(selected: list[tuple[dict, float]]) -> str:
     return "\n".join(lines)
 
 
-def _get_git_head(project_dir: Path) -> str | None:
-    """Get the current git HEAD SHA, or None if not a git repo."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=3,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return None
-
-
 def main():
     # Get the project directory from the command line argument
     if len(sys.argv) > 1:
@@ -300,7 +358,7 @@ def main():
     # 5. Log what was injected (for the feedback hook)
     # We also record the git HEAD SHA so feedback.py can diff against it
     # to detect if injected knowledge was actually applied in the code.
-    git_head = _get_git_head(project_dir)
+    git_head = context["git_head"]
     log = {
         "session_id": datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S"),
         "started_at": datetime.now(timezone.utc).isoformat(),
@@ -310,9 +368,11 @@ def main():
     }
     save_session_log(log)
 
-    # 6. Increment times_surfaced for each injected card
-    for card_entry, _ in selected:
-        increment_surfaced(card_entry["name"])
+    # 6. Increment times_surfaced for each injected card (one index
+    # read and write for all of them)
+    with index_transaction():
+        for card_entry, _ in selected:
+            increment_surfaced(card_entry["name"])
 
 
 if __name__ == "__main__":
@@ -17,18 +17,33 @@ Dependencies:
   - python-frontmatter: reads/writes markdown files with YAML headers
   - tiktoken: counts tokens to enforce the 250-token injection cap
   - pathlib: modern Python path handling (built-in)
+
+Both third-party dependencies are imported inside the functions that use
+them. The hooks and CLI commands that only touch _index.json (listing,
+searching, injection) then start without loading YAML or the tokenizer.
 """
 
 from __future__ import annotations
 
+import functools
 import json
+import os
+import re
+import stat
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    import tiktoken
 
-import frontmatter
-import tiktoken
+try:
+    import orjson  # Optional — see _dumps_json()
+except ImportError:
+    orjson = None
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -40,6 +55,12 @@ KNOWLEDGE_BASE_DIR = Path.home() / ".config" / "feedfwd"
 KNOWLEDGE_CARDS_DIR = KNOWLEDGE_BASE_DIR / "knowledge"
 INDEX_PATH = KNOWLEDGE_BASE_DIR / "_index.json"
 SESSION_LOG_PATH = KNOWLEDGE_BASE_DIR / "_session_log.json"
+REBUILD_STATE_PATH = KNOWLEDGE_BASE_DIR / "_rebuild_state.json"
+
+# _index.json schema version. Version 2 keys cards by name instead of
+# storing a list; version 3 stores every entry's keywords lowercased.
+# load_index() upgrades older files.
+INDEX_VERSION = 3
 
 # Default categories — each becomes a subdirectory under knowledge/
 DEFAULT_CATEGORIES = [
@@ -68,6 +89,10 @@ MAX_SCORE = 1.0
 # of keywords, the newer one is considered a duplicate.
 DUPLICATE_KEYWORD_OVERLAP = 0.60
 
+# rebuild_index() parses cards in worker processes once there are at
+# least this many; below it, starting the pool costs more than it saves.
+REBUILD_PARALLEL_MIN_CARDS = 256
+
 
 # ---------------------------------------------------------------------------
 # Token Counting
@@ -83,6 +108,7 @@ def _get_encoder() -> tiktoken.Encoding:
     """Lazy-load the tiktoken encoder (only initialized on first use)."""
     global _encoder
     if _encoder is None:
+        import tiktoken
         _encoder = tiktoken.get_encoding(TOKENIZER_ENCODING)
     return _encoder
 
@@ -92,9 +118,16 @@ def count_tokens(text: str) -> int:
 
     Used to enforce the 250-token cap on injection text and the
     400-token session budget. Returns 0 for empty/None input.
+    Results are cached, so re-counting the same text is a dict lookup.
     """
     if not text:
         return 0
+    return _count_tokens_cached(text)
+
+
+@functools.lru_cache(maxsize=4096)
+def _count_tokens_cached(text: str) -> int:
+    """Tokenize and count — cached per distinct string (see count_tokens)."""
     return len(_get_encoder().encode(text))
 
 
@@ -102,7 +135,7 @@ def count_tokens(text: str) -> int:
 # Data Model
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Triggers:
     """What signals make a knowledge card relevant to a session.
 
@@ -116,7 +149,7 @@ class Triggers:
     task_types: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class KnowledgeCard:
     """In-memory representation of a FeedFwd knowledge card.
 
@@ -161,12 +194,37 @@ class KnowledgeCard:
 # Card I/O — Reading and Writing .md Files
 # ---------------------------------------------------------------------------
 
+# The --- lines around the YAML header (python-frontmatter's pattern)
+_FRONTMATTER_BOUNDARY = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+
+
+def _split_frontmatter(text: str) -> tuple[dict, str]:
+    """Split a card file into (metadata, body), like frontmatter.parse().
+
+    Returns empty metadata and the whole text if there's no header.
+    """
+    import yaml
+
+    text = text.strip()
+    if not _FRONTMATTER_BOUNDARY.match(text):
+        return {}, text
+
+    parts = _FRONTMATTER_BOUNDARY.split(text, 2)
+    if len(parts) != 3:
+        return {}, text
+
+    _, header, body = parts
+    meta = yaml.load(header, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    return (meta if isinstance(meta, dict) else {}), body.strip()
+
+
 def read_card(path: Path) -> KnowledgeCard:
     """Read a knowledge card from a .md file.
 
-    Uses python-frontmatter to parse the YAML header and markdown body.
-    The markdown body is split into sections (Insight, Injection Text,
-    Example) by looking for ## headings.
+    Splits off the YAML header the same way python-frontmatter does and
+    parses it with PyYAML, using the libyaml-backed CSafeLoader when it
+    is available. The markdown body is split into sections (Insight,
+    Injection Text, Example) by looking for ## headings.
 
     Args:
         path: Full path to the .md file.
@@ -178,12 +236,11 @@ def read_card(path: Path) -> KnowledgeCard:
         FileNotFoundError: If the file doesn't exist.
         ValueError: If the file is missing required frontmatter fields.
     """
-    post = frontmatter.load(str(path))
-    meta = post.metadata
+    meta, content = _split_frontmatter(path.read_text(encoding="utf-8"))
 
     # Parse the markdown body into sections by splitting on ## headings.
     # This is simple string parsing — we look for lines starting with "## ".
-    sections = _parse_sections(post.content)
+    sections = _parse_sections(content)
 
     # Build the Triggers from the nested YAML structure.
     # The YAML might have triggers as a dict with sub-keys, or it might
@@ -226,6 +283,10 @@ def write_card(card: KnowledgeCard) -> Path:
     # Ensure the category directory exists
     card.file_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Keywords are stored lowercase, so readers can compare them against
+    # lowercased text as-is (see entry_keywords_lc)
+    card.triggers.keywords = [kw.lower() for kw in card.triggers.keywords]
+
     # Build the YAML frontmatter as a dict.
     # python-frontmatter will serialize this to YAML automatically.
     metadata = {
@@ -257,6 +318,8 @@ def write_card(card: KnowledgeCard) -> Path:
 
     # Create the frontmatter Post object and write it.
     # python-frontmatter handles the --- delimiters automatically.
+    import frontmatter
+
     post = frontmatter.Post(body, **metadata)
     card.file_path.write_text(frontmatter.dumps(post) + "\n")
 
@@ -280,6 +343,10 @@ def delete_card_file(card_name: str, category: str) -> bool:
     return False
 
 
+# A "## Heading" line, matched together with the newline before it
+_SECTION_HEADING = re.compile(r"\n## ([^\n]*)")
+
+
 def _parse_sections(markdown_body: str) -> dict[str, str]:
     """Split a markdown body into sections by ## headings.
 
@@ -296,26 +363,14 @@ def _parse_sections(markdown_body: str) -> dict[str, str]:
     This is intentionally simple — we just split on lines starting
     with "## " and use the heading text as the key.
     """
-    sections: dict[str, str] = {}
-    current_heading: str | None = None
-    current_lines: list[str] = []
-
-    for line in markdown_body.split("\n"):
-        if line.startswith("## "):
-            # Save the previous section (if any)
-            if current_heading is not None:
-                sections[current_heading] = "\n".join(current_lines)
-            # Start a new section
-            current_heading = line[3:].strip()
-            current_lines = []
-        else:
-            current_lines.append(line)
-
-    # Don't forget the last section
-    if current_heading is not None:
-        sections[current_heading] = "\n".join(current_lines)
-
-    return sections
+    # A leading newline lets a heading on the very first line match too.
+    # split() returns [preamble, heading1, body1, heading2, body2, ...];
+    # each body still starts with its heading line's newline.
+    parts = _SECTION_HEADING.split("\n" + markdown_body)
+    return {
+        heading.strip(): body[1:]
+        for heading, body in zip(parts[1::2], parts[2::2])
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -328,44 +383,264 @@ def load_index() -> dict:
     The index is a JSON cache of card metadata for fast lookups.
     The SessionStart hook reads this instead of parsing every .md file.
 
+    Cards are stored as {name: entry} so lookups by name are a single
+    dict probe. Version 1 indexes stored them as a list; those are
+    converted here and written back in the new form on the next save.
+
+    The parsed index is kept in memory and reused until _index.json
+    changes on disk, so repeated loads in one process parse the JSON
+    once. Each call gets its own copy of it, so a caller that modifies
+    the result without saving it can't affect later loads. Inside
+    index_transaction(), this returns the transaction's copy.
+
     Returns:
         The parsed JSON as a dict with keys: version, last_updated, cards.
         If the file doesn't exist or is corrupt, returns a fresh empty index.
     """
-    if not INDEX_PATH.exists():
+    txn = getattr(_transaction, "state", None)
+    if txn is not None:
+        return txn["index"]
+    return _copy_index(_read_index())
+
+
+def _read_index() -> dict:
+    """Parse _index.json from disk (see load_index).
+
+    Returns the cached dict itself — callers outside this module get a
+    _copy_index() of it.
+
+    The file is read as bytes (the JSON parser decodes them itself),
+    which skips the text-mode I/O layer for a one-shot whole-file read.
+    """
+    global _index_cache
+
+    key = _index_file_key()
+    if key is None:
         return _empty_index()
+    if _index_cache is not None and _index_cache[0] == key:
+        return _index_cache[1]
 
     try:
-        data = json.loads(INDEX_PATH.read_text())
-        # Basic validation — make sure it has the expected shape
-        if "cards" not in data:
-            return _empty_index()
-        return data
-    except (json.JSONDecodeError, KeyError):
+        data = _loads_json(INDEX_PATH.read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return _empty_index()
+    # Basic validation — make sure it has the expected shape
+    if not isinstance(data, dict) or "cards" not in data:
         return _empty_index()
+    if data.get("version") != INDEX_VERSION:
+        _upgrade_index(data)
+
+    _index_cache = (key, data)
+    return data
+
+
+def _upgrade_index(data: dict) -> None:
+    """Bring an index from an older schema version up to INDEX_VERSION.
+
+    The upgraded form is written back on the next save_index().
+    Malformed entries (not an object, or a list entry with no name) are
+    skipped with a warning rather than failing the whole load — the
+    card files are still on disk, and rebuild_index() puts them back.
+    """
+    cards = data["cards"]
+    if isinstance(cards, list):
+        cards = {
+            entry.get("name") if isinstance(entry, dict) else None: entry
+            for entry in cards
+        }
+    elif not isinstance(cards, dict):
+        cards = {}
+
+    upgraded = {}
+    for name, entry in cards.items():
+        if not isinstance(name, str) or not isinstance(entry, dict):
+            print(f"Warning: Skipping malformed index entry: {entry!r}")
+            continue
+        keywords = entry.get("keywords")
+        if not isinstance(keywords, list):
+            keywords = []
+        entry["keywords"] = [kw.lower() for kw in keywords if isinstance(kw, str)]
+        entry.pop("keywords_lc", None)
+        upgraded[name] = entry
+    data["cards"] = upgraded
+    data["version"] = INDEX_VERSION
+
+
+def _copy_index(index: dict) -> dict:
+    """Copy an index down to each entry's lists.
+
+    Entries only hold strings, numbers and lists of strings, so this is
+    as safe as copy.deepcopy() and much cheaper.
+    """
+    return {
+        **index,
+        "cards": {
+            name: {
+                key: value[:] if isinstance(value, list) else value
+                for key, value in entry.items()
+            }
+            for name, entry in index["cards"].items()
+        },
+    }
+
+
+# The last index this process read or wrote, with the _index_file_key()
+# it had on disk at the time
+_index_cache: Optional[tuple[tuple[int, int, int], dict]] = None
+
+
+def _index_file_key() -> Optional[tuple[int, int, int]]:
+    """Identify the current version of _index.json, or None if missing.
+
+    save_index() replaces the file by renaming, so a rewrite gets a new
+    inode as well as a new mtime.
+    """
+    try:
+        st = INDEX_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _loads_json(data: bytes):
+    """Parse JSON bytes, with orjson when it's installed."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps_json(obj, indent: bool = True) -> bytes:
+    """Serialize to JSON bytes with a trailing newline.
+
+    The index and session log are rewritten on every card update, so
+    orjson (several times faster than the json module) is used when
+    it's installed. Both produce the same layout — two-space indented,
+    or compact with indent=False; orjson writes non-ASCII text as UTF-8
+    instead of \\u escapes.
+    """
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return (json.dumps(obj, indent=2) + "\n").encode()
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode()
+
+
+def _replace_file(path: Path, data: bytes) -> None:
+    """Write a file atomically: write a temp file, then rename it over.
+
+    A hook killed mid-write would otherwise leave a truncated
+    _index.json behind. The rename is atomic, so readers see either the
+    old file or the new one. The temp file isn't fsync'd — the index is
+    a cache that rebuild_index() can regenerate — unless FEEDFWD_FSYNC
+    is set in the environment.
+
+    A file being replaced keeps its permissions. If anything fails
+    before the rename, the temp file is removed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            if os.environ.get("FEEDFWD_FSYNC"):
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            mode = stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            pass
+        else:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
 
 
 def save_index(index: dict) -> None:
     """Write the _index.json file.
 
-    Updates the last_updated timestamp automatically. Writes with
-    indent=2 for human readability (you can open this file and
-    inspect it — that's intentional).
+    Updates the last_updated timestamp automatically. The index is
+    rewritten on every card update, so it's written as compact JSON;
+    set FEEDFWD_PRETTY_INDEX in the environment to get indent=2 output
+    you can open and read (or run it through `python -m json.tool`).
+
+    Inside index_transaction(), this only records the index as changed
+    (a freshly built dict, as from rebuild_index(), replaces the shared
+    one); the file is written once when the transaction ends.
 
     Args:
         index: The full index dict to write.
     """
+    txn = getattr(_transaction, "state", None)
+    if txn is not None:
+        txn["index"] = index
+        txn["dirty"] = True
+        return
+    _write_index(index)
+
+
+def _write_index(index: dict) -> None:
+    """Serialize the index to _index.json (see save_index)."""
+    global _index_cache
+
     index["last_updated"] = datetime.now(timezone.utc).isoformat()
-    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
-    INDEX_PATH.write_text(json.dumps(index, indent=2) + "\n")
+    pretty = bool(os.environ.get("FEEDFWD_PRETTY_INDEX"))
+    _replace_file(INDEX_PATH, _dumps_json(index, indent=pretty))
+    # Cached as a copy — the caller still holds the dict it passed in
+    _index_cache = (_index_file_key(), _copy_index(index))
+
+
+# Per-thread state of the active index_transaction(), if any
+_transaction = threading.local()
+
+
+@contextmanager
+def index_transaction() -> Iterator[dict]:
+    """Batch several index operations into one read and one write.
+
+    Every load_index() inside the block returns the same dict, and
+    save_index() just marks it as changed. On exit the index is written
+    once, if anything was saved. Nested transactions join the outer
+    one. If the block raises, nothing is written.
+
+        with index_transaction():
+            for name in names:
+                increment_surfaced(name)
+
+    Yields:
+        The shared index dict. Call save_index() on it after mutating
+        it directly so the change gets written.
+    """
+    txn = getattr(_transaction, "state", None)
+    if txn is not None:
+        yield txn["index"]
+        return
+
+    global _index_cache
+
+    txn = _transaction.state = {"index": _copy_index(_read_index()), "dirty": False}
+    try:
+        yield txn["index"]
+    except BaseException:
+        # Don't trust anything the failed block may have touched; the
+        # next load re-reads _index.json
+        _index_cache = None
+        raise
+    finally:
+        _transaction.state = None
+    if txn["dirty"]:
+        _write_index(txn["index"])
 
 
 def _empty_index() -> dict:
     """Return a fresh, empty index structure."""
     return {
-        "version": 1,
+        "version": INDEX_VERSION,
         "last_updated": None,
-        "cards": [],
+        "cards": {},
     }
 
 
@@ -384,7 +659,7 @@ def card_to_index_entry(card: KnowledgeCard) -> dict:
         "times_surfaced": card.times_surfaced,
         "times_useful": card.times_useful,
         "injection_tokens": card.injection_tokens,
-        "keywords": card.triggers.keywords,
+        "keywords": [kw.lower() for kw in card.triggers.keywords],
         "file_patterns": card.triggers.file_patterns,
         "task_types": card.triggers.task_types,
     }
@@ -396,12 +671,7 @@ def add_card_to_index(card: KnowledgeCard) -> None:
     This is called after write_card() to keep the index in sync.
     """
     index = load_index()
-
-    # Remove existing entry with the same name (if updating)
-    index["cards"] = [c for c in index["cards"] if c["name"] != card.name]
-
-    # Add the new entry
-    index["cards"].append(card_to_index_entry(card))
+    index["cards"][card.name] = card_to_index_entry(card)
     save_index(index)
 
 
@@ -412,13 +682,10 @@ def remove_card_from_index(card_name: str) -> bool:
         True if the card was found and removed, False if not found.
     """
     index = load_index()
-    original_count = len(index["cards"])
-    index["cards"] = [c for c in index["cards"] if c["name"] != card_name]
-
-    if len(index["cards"]) < original_count:
-        save_index(index)
-        return True
-    return False
+    if index["cards"].pop(card_name, None) is None:
+        return False
+    save_index(index)
+    return True
 
 
 def update_card_in_index(card_name: str, **updates) -> bool:
@@ -433,16 +700,15 @@ def update_card_in_index(card_name: str, **updates) -> bool:
         True if the card was found and updated, False if not found.
     """
     index = load_index()
+    entry = index["cards"].get(card_name)
+    if entry is None:
+        return False
 
-    for entry in index["cards"]:
-        if entry["name"] == card_name:
-            for key, value in updates.items():
-                if key in entry:
-                    entry[key] = value
-            save_index(index)
-            return True
-
-    return False
+    for key, value in updates.items():
+        if key in entry:
+            entry[key] = value
+    save_index(index)
+    return True
 
 
 def find_card_in_index(card_name: str) -> Optional[dict]:
@@ -451,44 +717,159 @@ def find_card_in_index(card_name: str) -> Optional[dict]:
     Returns:
         The index entry dict, or None if not found.
     """
-    index = load_index()
-    for entry in index["cards"]:
-        if entry["name"] == card_name:
-            return entry
-    return None
+    return load_index()["cards"].get(card_name)
+
+
+def entry_keywords_lc(entry: dict) -> list[str]:
+    """Return an index entry's keywords, lowercased.
+
+    The hooks and find_duplicates() compare keywords against lowercased
+    text. card_to_index_entry() stores keywords lowercased — even for
+    cards whose files were written or edited by hand — and load_index()
+    lowercases entries from older indexes, so this is just a lookup.
+    """
+    return entry.get("keywords", [])
+
 
+def _iter_card_files(directory: str) -> Iterator[os.DirEntry]:
+    """Yield every .md file under a directory, recursively.
 
-def rebuild_index() -> dict:
-    """Rebuild _index.json from scratch by scanning all .md files.
+    os.scandir() hands back each entry's type with its name, so unlike
+    Path.rglob() no Path objects are built for the directory walk and
+    no extra stat is needed to tell files from directories.
+
+    Symlinks are not followed, as with the Path.rglob() walk this
+    replaced, so a linked directory can't be visited twice or loop.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_card_files(entry.path)
+            elif entry.name.endswith(".md") and entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _index_entry_for(md_file: Path) -> tuple[Optional[dict], Optional[str]]:
+    """Read one card for rebuild_index().
+
+    Returns (entry, None) on success or (None, error message) if the
+    file can't be parsed. Module-level so worker processes can run it.
+    """
+    try:
+        return card_to_index_entry(read_card(md_file)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def rebuild_index(incremental: bool = False) -> dict:
+    """Rebuild _index.json by scanning all .md files.
 
     This is the "nuclear option" — if the index gets corrupted or
     out of sync, this re-reads every card file and regenerates the
     index. Normally you shouldn't need this because every write
     operation updates the index incrementally.
 
+    Each rebuild records the mtime of every file it read in
+    _rebuild_state.json (kept out of _index.json, which is rewritten on
+    every card update). With incremental=True, files whose mtime still
+    matches reuse their existing entry and only new or modified files
+    are parsed; every file is still stat'd, so in-place edits are
+    picked up. Without a usable previous rebuild record, this is the
+    same as a full rebuild.
+
     Returns:
         The newly built index dict.
     """
+    previous = load_index() if incremental else _empty_index()
+    previous_files = _load_rebuild_state() if incremental else {}
+
     index = _empty_index()
 
     if not KNOWLEDGE_CARDS_DIR.exists():
         save_index(index)
         return index
 
-    # Walk all .md files in all category subdirectories
-    for md_file in sorted(KNOWLEDGE_CARDS_DIR.rglob("*.md")):
-        try:
-            card = read_card(md_file)
-            index["cards"].append(card_to_index_entry(card))
-        except Exception as e:
-            # Skip files that can't be parsed — don't let one bad
-            # card break the entire index rebuild.
-            print(f"Warning: Could not parse {md_file}: {e}")
+    # Walk all .md files in all category subdirectories, setting aside
+    # the ones the last rebuild already read and that haven't changed.
+    # Sorting keeps the index order (and which file wins if two cards
+    # share a name) the same from one rebuild to the next.
+    root = str(KNOWLEDGE_CARDS_DIR)
+    md_files: list[Path] = []
+    rels: dict[Path, str] = {}
+    mtimes: dict[str, int] = {}
+    for dir_entry in sorted(_iter_card_files(root), key=lambda e: e.path):
+        md_file = Path(dir_entry.path)
+        rel = rels[md_file] = dir_entry.path[len(root) + 1:].replace(os.sep, "/")
+        mtimes[rel] = dir_entry.stat().st_mtime_ns
+        md_files.append(md_file)
+
+    reused: dict[Path, dict] = {}
+    to_read: list[Path] = []
+    for md_file in md_files:
+        rel = rels[md_file]
+        seen = previous_files.get(rel)
+        entry = previous["cards"].get(seen["name"]) if seen else None
+        if entry is not None and seen["mtime_ns"] == mtimes[rel]:
+            reused[md_file] = entry
+        else:
+            to_read.append(md_file)
+
+    # Parsing is mostly YAML work and independent per file, so large
+    # knowledge bases are spread across processes; for a handful of
+    # cards the process startup would cost more than it saves.
+    if len(to_read) >= REBUILD_PARALLEL_MIN_CARDS and (os.cpu_count() or 1) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor() as pool:
+            results = dict(zip(to_read, pool.map(_index_entry_for, to_read, chunksize=32)))
+    else:
+        results = {md_file: _index_entry_for(md_file) for md_file in to_read}
+
+    # Entries are collected in memory and the index is saved once
+    rebuild_files: dict[str, dict] = {}
+    for md_file in md_files:
+        entry = reused.get(md_file)
+        if entry is None:
+            entry, error = results[md_file]
+            if entry is None:
+                # Skip files that can't be parsed — don't let one bad
+                # card break the entire index rebuild.
+                print(f"Warning: Could not parse {md_file}: {error}")
+                continue
+        index["cards"][entry["name"]] = entry
+        rel = rels[md_file]
+        rebuild_files[rel] = {"name": entry["name"], "mtime_ns": mtimes[rel]}
 
     save_index(index)
+    _replace_file(
+        REBUILD_STATE_PATH,
+        _dumps_json({"version": INDEX_VERSION, "files": rebuild_files}, indent=False),
+    )
     return index
 
 
+def _load_rebuild_state() -> dict[str, dict]:
+    """Read the {relative path: {name, mtime_ns}} map of the last rebuild.
+
+    Returns an empty map if there's no usable record. Malformed
+    per-file records are dropped, so those files are simply re-read.
+    """
+    try:
+        state = _loads_json(REBUILD_STATE_PATH.read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != INDEX_VERSION:
+        return {}
+    files = state.get("files")
+    if not isinstance(files, dict):
+        return {}
+    return {
+        rel: seen
+        for rel, seen in files.items()
+        if isinstance(seen, dict) and "name" in seen and "mtime_ns" in seen
+    }
+
+
 # ---------------------------------------------------------------------------
 # Duplicate Detection
 # ---------------------------------------------------------------------------
@@ -519,24 +900,31 @@ def find_duplicates(
         The index entry of the duplicate card, or None if no duplicate.
     """
     index = load_index()
-    proposed_kw = {kw.lower() for kw in keywords} if keywords else set()
+    proposed_kw = frozenset(kw.lower() for kw in keywords) if keywords else frozenset()
     proposed_name = card_name.lower()
 
-    for entry in index["cards"]:
-        # Check 1: Exact name match (always checked, even with no keywords)
-        existing_name = entry["name"].lower()
-        if existing_name == proposed_name:
+    # Check 1: Exact name match (always checked, even with no keywords).
+    # The index is keyed by name, so the common case is one dict probe;
+    # differently-cased names are still caught in the loop below.
+    entry = index["cards"].get(card_name)
+    if entry is not None:
+        return entry
+
+    for entry in index["cards"].values():
+        if entry["name"].lower() == proposed_name:
             return entry
 
-        # Check 2: Keyword overlap (only if we have keywords to compare)
+        # Check 2: Keyword overlap (only if we have keywords to compare).
+        # Only keywords that appear in the proposal are collected, so the
+        # many cards that share nothing with it cost one lookup per keyword
+        # instead of a full set build and intersection.
         if not proposed_kw:
             continue
 
-        existing_kw = {kw.lower() for kw in entry.get("keywords", [])}
-        if not existing_kw:
+        shared = {kw for kw in entry_keywords_lc(entry) if kw in proposed_kw}
+        if not shared:
             continue
 
-        shared = proposed_kw & existing_kw
         overlap = len(shared) / len(proposed_kw)
 
         if overlap >= threshold:
@@ -549,6 +937,158 @@ def find_duplicates(
 # Score Management
 # ---------------------------------------------------------------------------
 
+# Top-level numeric fields in a card's YAML frontmatter, as write_card()
+# lays them out — one "key: value" line each, unindented, in this order
+# (the YAML dump sorts keys).
+_COUNTER_FIELDS = ["score", "times_surfaced", "times_useful"]
+_COUNTER_LINE = re.compile(r"^(score|times_surfaced|times_useful): *(\S+) *$", re.MULTILINE)
+
+
+def _bump_card(
+    card_path: Path,
+    score_delta: float = 0.0,
+    surfaced: int = 0,
+    useful: int = 0,
+) -> tuple[float, int, int]:
+    """Apply a score delta and counter increments to a card's .md file.
+
+    These are the only fields that change after a card is created, so
+    rather than parsing the whole card and re-serializing it through
+    write_card(), we rewrite just their three lines in the frontmatter.
+    Files that don't have the expected layout (hand-edited, quoted
+    values, comments, missing or reordered fields) fall back to
+    update_card_metadata(), which still leaves the markdown body
+    untouched. For files that do, the result is byte-for-byte what
+    update_card_metadata() would have written.
+
+    The score is clamped to [0.0, 1.0].
+
+    Returns:
+        (new_score, times_surfaced, times_useful)
+    """
+    text, newline = _read_card_text(card_path)
+    end = text.find("\n---\n", 4) if text.startswith("---\n") else -1
+    head = text[:end] if end != -1 else ""
+    matches = list(_COUNTER_LINE.finditer(head))
+    fields = {m.group(1): m for m in matches}
+
+    try:
+        if [m.group(1) for m in matches] != _COUNTER_FIELDS:
+            raise ValueError("frontmatter not in write_card() layout")
+        score = float(fields["score"].group(2))
+        times_surfaced = int(fields["times_surfaced"].group(2)) + surfaced
+        times_useful = int(fields["times_useful"].group(2)) + useful
+    except ValueError:
+        meta, _ = _split_frontmatter(text)
+        score = max(MIN_SCORE, min(MAX_SCORE, float(meta.get("score", DEFAULT_SCORE)) + score_delta))
+        times_surfaced = int(meta.get("times_surfaced", 0)) + surfaced
+        times_useful = int(meta.get("times_useful", 0)) + useful
+        update_card_metadata(
+            card_path,
+            score=round(score, 2),
+            times_surfaced=times_surfaced,
+            times_useful=times_useful,
+        )
+        return score, times_surfaced, times_useful
+
+    score = max(MIN_SCORE, min(MAX_SCORE, score + score_delta))
+    values = {
+        "score": repr(round(score, 2)),
+        "times_surfaced": str(times_surfaced),
+        "times_useful": str(times_useful),
+    }
+    head = _COUNTER_LINE.sub(lambda m: f"{m.group(1)}: {values[m.group(1)]}", head)
+    _write_card_text(card_path, head + text[end:], newline)
+    return score, times_surfaced, times_useful
+
+
+def _read_card_text(card_path: Path) -> tuple[str, str]:
+    """Read a card file for an in-place edit.
+
+    Returns the text with "\\n" line endings and the newline the file
+    used, so _write_card_text() can put CRLF files back as CRLF.
+    """
+    text = card_path.read_bytes().decode("utf-8")
+    if "\r\n" in text:
+        return text.replace("\r\n", "\n"), "\r\n"
+    return text, "\n"
+
+
+def _write_card_text(card_path: Path, text: str, newline: str) -> None:
+    """Write back text from _read_card_text() with its original newlines."""
+    if newline != "\n":
+        text = text.replace("\n", newline)
+    _replace_file(card_path, text.encode("utf-8"))
+
+
+def update_card_metadata(card_path: Path, **fields) -> dict:
+    """Set frontmatter fields in a card's .md file, leaving the body as is.
+
+    Only the YAML header is parsed and re-dumped (the same way
+    write_card() dumps it); the markdown after it is spliced back
+    byte-for-byte, without splitting it into sections or building a
+    KnowledgeCard.
+
+        update_card_metadata(path, score=0.65, times_useful=3)
+
+    Returns:
+        The card's full metadata after the update.
+
+    Raises:
+        ValueError: If the file has no YAML frontmatter.
+    """
+    import yaml
+
+    # Leading blank lines are dropped, as read_card() ignores them too
+    text, newline = _read_card_text(card_path)
+    text = text.lstrip()
+    start = _FRONTMATTER_BOUNDARY.match(text)
+    end = _FRONTMATTER_BOUNDARY.search(text, start.end() + 1) if start else None
+    if end is None:
+        raise ValueError(f"No frontmatter in {card_path}")
+
+    meta = yaml.load(
+        text[start.end():end.start()],
+        Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader),
+    )
+    if not isinstance(meta, dict):
+        raise ValueError(f"No frontmatter in {card_path}")
+    meta.update(fields)
+
+    header = yaml.dump(
+        meta,
+        Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+        default_flow_style=False,
+        allow_unicode=True,
+    )
+    new_text = text[:start.end()] + "\n" + header + text[end.start():]
+    _write_card_text(card_path, new_text, newline)
+    return meta
+
+
+def _bump_indexed_card(card_name: str, **changes) -> Optional[float]:
+    """Look up one card, apply _bump_card(), and update its index entry.
+
+    Loads and saves _index.json once. Returns the new score, or None if
+    the card wasn't found.
+    """
+    index = load_index()
+    entry = index["cards"].get(card_name)
+    if entry is None:
+        return None
+
+    card_path = KNOWLEDGE_CARDS_DIR / entry["file"]
+    if not card_path.exists():
+        return None
+
+    score, times_surfaced, times_useful = _bump_card(card_path, **changes)
+    entry["score"] = round(score, 2)
+    entry["times_surfaced"] = times_surfaced
+    entry["times_useful"] = times_useful
+    save_index(index)
+    return score
+
+
 def update_card_score(card_name: str, delta: float) -> Optional[float]:
     """Update a card's score by a delta amount.
 
@@ -562,58 +1102,54 @@ def update_card_score(card_name: str, delta: float) -> Optional[float]:
     Returns:
         The new score, or None if the card wasn't found.
     """
-    # First, find the card in the index to get its file path
-    entry = find_card_in_index(card_name)
-    if entry is None:
-        return None
+    return _bump_indexed_card(card_name, score_delta=delta)
 
-    # Read the full card from disk
-    card_path = KNOWLEDGE_CARDS_DIR / entry["file"]
-    if not card_path.exists():
-        return None
 
-    card = read_card(card_path)
+def batch_update_scores(updates: list[tuple[str, float, bool]]) -> dict[str, float]:
+    """Apply several score updates with a single _index.json write.
 
-    # Apply the delta and clamp
-    card.score = max(MIN_SCORE, min(MAX_SCORE, card.score + delta))
+    The feedback hook scores every injected card at the end of a session.
+    Each card's .md file is rewritten once, and the index is loaded and
+    saved once for the whole batch (see index_transaction).
 
-    # Write back to both .md and index
-    write_card(card)
-    update_card_in_index(card_name, score=round(card.score, 2))
+    If a card fails, the batch stops there and the error is re-raised,
+    but only after the index is saved — the cards before it already
+    have their new values on disk, and the index must match them.
 
-    return card.score
+    Args:
+        updates: (card_name, delta, mark_useful) tuples. The delta is
+            applied and clamped like update_card_score(); mark_useful
+            also increments times_useful.
+
+    Returns:
+        {card_name: new_score} for every card that was found.
+    """
+    new_scores: dict[str, float] = {}
+    failure: Optional[Exception] = None
+    with index_transaction():
+        for card_name, delta, mark_useful in updates:
+            try:
+                score = _bump_indexed_card(
+                    card_name, score_delta=delta, useful=int(mark_useful)
+                )
+            except Exception as e:
+                failure = e
+                break
+            if score is not None:
+                new_scores[card_name] = score
+    if failure is not None:
+        raise failure
+    return new_scores
 
 
 def increment_surfaced(card_name: str) -> None:
     """Increment times_surfaced for a card (called by inject.py)."""
-    entry = find_card_in_index(card_name)
-    if entry is None:
-        return
-
-    card_path = KNOWLEDGE_CARDS_DIR / entry["file"]
-    if not card_path.exists():
-        return
-
-    card = read_card(card_path)
-    card.times_surfaced += 1
-    write_card(card)
-    update_card_in_index(card_name, times_surfaced=card.times_surfaced)
+    _bump_indexed_card(card_name, surfaced=1)
 
 
 def increment_useful(card_name: str) -> None:
     """Increment times_useful for a card (called by feedback.py)."""
-    entry = find_card_in_index(card_name)
-    if entry is None:
-        return
-
-    card_path = KNOWLEDGE_CARDS_DIR / entry["file"]
-    if not card_path.exists():
-        return
-
-    card = read_card(card_path)
-    card.times_useful += 1
-    write_card(card)
-    update_card_in_index(card_name, times_useful=card.times_useful)
+    _bump_indexed_card(card_name, useful=1)
 
 
 # ---------------------------------------------------------------------------
@@ -629,19 +1165,17 @@ def load_session_log() -> dict:
     Returns:
         The session log dict, or a fresh empty log if file is missing.
     """
-    if not SESSION_LOG_PATH.exists():
-        return _empty_session_log()
-
     try:
-        return json.loads(SESSION_LOG_PATH.read_text())
+        return _loads_json(SESSION_LOG_PATH.read_bytes())
+    except FileNotFoundError:
+        return _empty_session_log()
     except (json.JSONDecodeError, KeyError):
         return _empty_session_log()
 
 
 def save_session_log(log: dict) -> None:
     """Write _session_log.json."""
-    SESSION_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    SESSION_LOG_PATH.write_text(json.dumps(log, indent=2) + "\n")
+    _replace_file(SESSION_LOG_PATH, _dumps_json(log))
 
 
 def _empty_session_log() -> dict:
@@ -692,16 +1226,49 @@ def create_card(
     Returns:
         The created KnowledgeCard instance.
     """
+    card = _new_card(
+        name=name,
+        source=source,
+        category=category,
+        insight=insight,
+        injection_text=injection_text,
+        example=example,
+        keywords=keywords,
+        file_patterns=file_patterns,
+        task_types=task_types,
+        score=score,
+    )
+
+    # Write to disk and update the index
+    write_card(card)
+    add_card_to_index(card)
+
+    return card
+
+
+def _new_card(
+    name: str,
+    source: str,
+    category: str,
+    insight: str,
+    injection_text: str,
+    example: str,
+    keywords: list[str],
+    file_patterns: list[str] | None = None,
+    task_types: list[str] | None = None,
+    score: float = DEFAULT_SCORE,
+) -> KnowledgeCard:
+    """Build (but don't write) a card from create_card()'s arguments."""
     token_count = count_tokens(injection_text)
 
-    card = KnowledgeCard(
+    return KnowledgeCard(
         name=name,
         source=source,
         captured=datetime.now(timezone.utc).strftime("%Y-%m-%d"),
         category=category,
         score=score,
         triggers=Triggers(
-            keywords=keywords,
+            keywords=[kw.lower() for kw in keywords],
             file_patterns=file_patterns or [],
             task_types=task_types or [],
         ),
@@ -711,12 +1278,6 @@ def create_card(
         example=example,
     )
 
-    # Write to disk and update the index
-    write_card(card)
-    add_card_to_index(card)
-
-    return card
-
 
 def remove_card(card_name: str) -> bool:
     """Remove a card completely: delete the .md file and update the index.
@@ -727,14 +1288,63 @@ def remove_card(card_name: str) -> bool:
     Returns:
         True if the card was found and removed, False otherwise.
     """
-    entry = find_card_in_index(card_name)
-    if entry is None:
-        return False
+    with index_transaction() as index:
+        # Take the entry out of the index (one lookup, nothing copied);
+        # if deleting the file fails, the transaction isn't saved
+        entry = index["cards"].pop(card_name, None)
+        if entry is None:
+            return False
 
-    # Delete the file
-    delete_card_file(card_name, entry["category"])
+        # Delete the file
+        delete_card_file(card_name, entry["category"])
 
-    # Remove from index
-    remove_card_from_index(card_name)
+        save_index(index)
 
     return True
+
+
+def create_cards(specs: list[dict]) -> list[KnowledgeCard]:
+    """Create several cards with a single _index.json update.
+
+    Each spec is a dict of create_card() keyword arguments. All the .md
+    files are written first and the index is loaded and saved once for
+    the whole batch, instead of once per card.
+
+    The batch is all-or-nothing: every card is built (and its tokens
+    counted) before any file is written, and if a write fails, the files
+    already written are removed — or put back, if the batch had
+    overwritten an existing card — before the error is raised.
+
+    Returns:
+        The created KnowledgeCard instances, in the order given.
+    """
+    cards = [_new_card(**spec) for spec in specs]
+
+    # Card file path -> its contents before this batch (None if new)
+    originals: dict[Path, Optional[bytes]] = {}
+    try:
+        with index_transaction():
+            for card in cards:
+                path = card.file_path
+                if path not in originals:
+                    originals[path] = path.read_bytes() if path.exists() else None
+                write_card(card)
+                add_card_to_index(card)
+    except BaseException:
+        for path, original in originals.items():
+            if original is None:
+                path.unlink(missing_ok=True)
+            else:
+                path.write_bytes(original)
+        raise
+    return cards
+
+
+def remove_cards(card_names: list[str]) -> list[str]:
+    """Remove several cards with a single _index.json update.
+
+    Returns:
+        The names of the cards that were found and removed.
+    """
+    with index_transaction():
+        return [name for name in card_names if remove_card(name)]
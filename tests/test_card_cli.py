@@ -0,0 +1,44 @@
+"""Tests for scripts/card_cli.py.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import card_cli  # noqa: E402
+
+
+class CountTokensCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(card_cli, "TOKEN_CACHE_DIR", Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def count(self, text: str) -> str:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(card_cli.cmd_count_tokens([text]), 0)
+        return out.getvalue()
+
+    def test_cache_hit_prints_once_when_touch_fails(self):
+        with mock.patch.object(card_cli, "count_tokens", return_value=7):
+            self.assertEqual(self.count("some draft"), "7\n")
+
+        with mock.patch.object(card_cli, "count_tokens") as counter, \
+                mock.patch.object(Path, "touch", side_effect=OSError):
+            self.assertEqual(self.count("some draft"), "7\n")
+        counter.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
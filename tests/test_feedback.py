@@ -0,0 +1,148 @@
+"""Tests for scripts/feedback.py.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import feedback  # noqa: E402
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class GitRepoTestCase(unittest.TestCase):
+    """Runs each test in a throwaway git repo with one initial commit."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = Path(tmp.name)
+        self.git("init", "-q")
+        self.git("config", "user.email", "test@example.com")
+        self.git("config", "user.name", "Test")
+        self.write("README", "initial\n")
+        self.commit("initial")
+        self.head = self.git("rev-parse", "HEAD").strip()
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=self.repo, check=True, capture_output=True, text=True
+        ).stdout
+
+    def write(self, rel_path: str, text: str) -> None:
+        (self.repo / rel_path).write_text(text)
+
+    def commit(self, message: str) -> None:
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", message)
+
+    def scan_diff(self, keywords: set[str], timeout: float = 5):
+        return feedback._scan_git_diff(
+            [*feedback.DIFF_ARGS, "HEAD"], str(self.repo), keywords, timeout
+        )
+
+
+class ScanGitDiffTests(GitRepoTestCase):
+    def test_hits_across_chunk_boundaries(self):
+        # A file with no known extension, so the content markers count.
+        # Each chunk size puts the batch boundaries somewhere else in the
+        # long line holding the keyword and the marker.
+        self.write("script", "start\n")
+        self.commit("add script")
+        self.write("script", "start\n" + "pad " * 20 + "frobnicate_widget; def handler\n")
+
+        for chunk_bytes in range(5, 70, 3):
+            with self.subTest(chunk_bytes=chunk_bytes):
+                with mock.patch.object(feedback, "DIFF_CHUNK_BYTES", chunk_bytes):
+                    files, scan = self.scan_diff({"frobnicate_widget", "absent"})
+
+                self.assertEqual(files, ["script"])
+                self.assertTrue(scan.markers_needed)
+                self.assertEqual(scan.found, {"frobnicate_widget"})
+                self.assertTrue(scan.code_markers)
+
+    def test_stops_git_once_scan_is_complete(self):
+        self.write("big.py", "x = 0\n")
+        self.commit("add big.py")
+        filler = "".join(f"filler line {i}\n" for i in range(150_000))
+        self.write("big.py", "needle = 1\n" + filler)
+        diff_bytes = len(filler)
+
+        procs = []
+        real_popen = subprocess.Popen
+
+        def popen(*args, **kwargs):
+            procs.append(real_popen(*args, **kwargs))
+            return procs[-1]
+
+        with mock.patch.object(feedback, "DIFF_CHUNK_BYTES", 4096), \
+                mock.patch.object(feedback.subprocess, "Popen", side_effect=popen):
+            files, scan = self.scan_diff({"needle"})
+
+        self.assertEqual(files, ["big.py"])
+        self.assertEqual(scan.found, {"needle"})
+        self.assertLess(scan.bytes_scanned, diff_bytes // 10)
+        self.assertLess(procs[0].returncode, 0)  # Killed, not finished
+
+    def test_timeout_reports_failure(self):
+        real_popen = subprocess.Popen
+        hang = "import sys, time; sys.stdout.write(':x\\n'); sys.stdout.flush(); time.sleep(30)"
+
+        def popen(cmd, **kwargs):
+            return real_popen([sys.executable, "-c", hang], **kwargs)
+
+        started = time.monotonic()
+        with mock.patch.object(feedback.subprocess, "Popen", side_effect=popen):
+            result = self.scan_diff({"needle"}, timeout=0.2)
+
+        self.assertIsNone(result)
+        self.assertLess(time.monotonic() - started, 10)
+
+
+class CollectGitStateTests(GitRepoTestCase):
+    def test_session_diff_is_net_of_reverts(self):
+        # Committed during the session, then reverted in the working tree
+        self.write("app.py", "frobnicate_widget()\n")
+        self.commit("add helper")
+        (self.repo / "app.py").unlink()
+        # Kept
+        self.write("README", "initial\nquux_handler\n")
+
+        scan, files = feedback.collect_git_state(
+            str(self.repo), self.head, keywords={"frobnicate_widget", "quux_handler"}
+        )
+
+        self.assertEqual(files, ["README"])
+        self.assertEqual(scan.found, {"quux_handler"})
+
+    def test_retry_shares_the_first_attempts_deadline(self):
+        timeouts = []
+
+        def scan_git_diff(args, project_dir, keywords, timeout):
+            timeouts.append(timeout)
+            time.sleep(0.3)  # Fails slowly, like a diff that timed out
+            return None
+
+        with mock.patch.object(feedback, "_scan_git_diff", side_effect=scan_git_diff):
+            with mock.patch.object(feedback, "DIFF_TIMEOUT", 1.0):
+                feedback.collect_git_state(str(self.repo), self.head)
+            self.assertEqual(len(timeouts), 2)
+            self.assertEqual(timeouts[0], 1.0)
+            self.assertLessEqual(timeouts[1], 0.7)
+
+            timeouts.clear()
+            with mock.patch.object(feedback, "DIFF_TIMEOUT", 0.2):
+                feedback.collect_git_state(str(self.repo), self.head)
+            self.assertEqual(timeouts, [0.2])  # No time left to retry
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Tests for scripts/fetch_url.py.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import fetch_url  # noqa: E402
+
+
+class ParseHtmlTests(unittest.TestCase):
+    def test_unknown_header_charset_falls_back_to_detection(self):
+        page = (
+            '<html><head><meta charset="utf-8"></head><body>'
+            "<article><p>Café au lait, naïve résumé.</p></article>"
+            "</body></html>"
+        ).encode("utf-8")
+        response = httpx.Response(
+            200,
+            headers={"content-type": "text/html; charset=utf8mb4"},
+            content=page,
+        )
+
+        root = fetch_url._parse_html(response)
+
+        self.assertIn("Café au lait, naïve résumé.", root.text_content())
+
+    def test_undeclared_page_is_read_as_utf8(self):
+        page = (
+            "<html><body><article><p>Café au lait, naïve résumé.</p>"
+            "</article></body></html>"
+        ).encode("utf-8")
+        response = httpx.Response(
+            200, headers={"content-type": "text/html"}, content=page
+        )
+
+        root = fetch_url._parse_html(response)
+
+        self.assertIn("Café au lait, naïve résumé.", root.text_content())
+
+    def test_meta_charset_is_honoured_without_header_charset(self):
+        page = (
+            '<html><head><meta charset="windows-1252"></head><body>'
+            "<article><p>Café au lait, naïve résumé.</p></article>"
+            "</body></html>"
+        ).encode("windows-1252")
+        response = httpx.Response(
+            200, headers={"content-type": "text/html"}, content=page
+        )
+
+        root = fetch_url._parse_html(response)
+
+        self.assertIn("Café au lait, naïve résumé.", root.text_content())
+
+
+if __name__ == "__main__":
+    unittest.main()
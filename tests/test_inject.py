@@ -0,0 +1,142 @@
+"""Tests for scripts/inject.py.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import random
+import sys
+import tempfile
+import unittest
+from fnmatch import fnmatch
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import inject  # noqa: E402
+
+
+def baseline_score_card(card_entry: dict, context: dict) -> float:
+    """score_card() as it was before keyword and pattern checks were shared."""
+    keywords = card_entry.get("keywords", [])
+    file_patterns = card_entry.get("file_patterns", [])
+    card_score = card_entry.get("score", 0.5)
+
+    if not keywords and not file_patterns:
+        return card_score * 0.4
+
+    text = context["text_context"]
+    keyword_hits = 0
+    for kw in keywords:
+        if kw.lower() in text:
+            keyword_hits += 1
+
+    keyword_score = keyword_hits / len(keywords) if keywords else 0.0
+
+    pattern_hits = 0
+    if file_patterns:
+        all_names = context["file_names"]
+        all_extensions = context["file_extensions"]
+        for pattern in file_patterns:
+            for ext in all_extensions:
+                if fnmatch(f"file{ext}", pattern):
+                    pattern_hits += 1
+                    break
+            else:
+                for name in all_names:
+                    if fnmatch(name, pattern):
+                        pattern_hits += 1
+                        break
+
+        pattern_score = pattern_hits / len(file_patterns)
+    else:
+        pattern_score = 0.0
+
+    overlap_score = keyword_score * 0.7 + pattern_score * 0.3
+    return overlap_score * 0.6 + card_score * 0.4
+
+
+def baseline_select_cards(cards: list[dict], context: dict) -> list[tuple[dict, float]]:
+    """select_cards() as it was, over the version 1 list of entries."""
+    scored = []
+    for card_entry in cards:
+        relevance = baseline_score_card(card_entry, context)
+        if relevance > inject.MIN_RELEVANCE:
+            scored.append((card_entry, relevance))
+    scored.sort(key=lambda x: x[1], reverse=True)
+
+    selected = []
+    total_tokens = inject.HEADER_TOKENS
+    for card_entry, relevance in scored:
+        if len(selected) >= inject.MAX_CARDS_PER_SESSION:
+            break
+        card_tokens = card_entry.get("injection_tokens", 0)
+        if total_tokens + card_tokens > inject.MAX_SESSION_TOKENS:
+            continue
+        selected.append((card_entry, relevance))
+        total_tokens += card_tokens
+    return selected
+
+
+KEYWORDS = [
+    "Pytest", "fixtures", "async", "async-generator", "docker", "compose",
+    "typescript", "react", "asyncio", "refactor", "ci", "migrations", "",
+]
+PATTERNS = ["*.py", "*.ts", "Dockerfile", "*.rs", "test_*.py", "*.md", "Makefile", "*.[jt]s"]
+
+
+class SelectCardsTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        project = Path(tmp.name)
+        (project / "CLAUDE.md").write_text(
+            "Use pytest fixtures and an async-generator for the Docker setup."
+        )
+        (project / "app.py").write_text("")
+        (project / "Dockerfile").write_text("")
+        (project / "src").mkdir()
+        (project / "src" / "main.ts").write_text("")
+        self.context = inject.get_project_context(project)
+
+        rng = random.Random(0)
+        self.cards = [
+            {"name": "no-triggers", "score": 0.9},
+            {"name": "keywords-miss", "keywords": ["react"], "score": 0.8},
+            {"name": "patterns-only", "file_patterns": ["Dockerfile", "*.rs"], "score": 0.4},
+        ]
+        for i in range(300):
+            self.cards.append({
+                "name": f"card-{i}",
+                "keywords": rng.sample(KEYWORDS, rng.randint(0, 5)),
+                "file_patterns": rng.sample(PATTERNS, rng.randint(0, 3)),
+                "score": round(rng.random(), 2),
+                "injection_tokens": rng.randint(40, 250),
+            })
+
+    def indexed(self, card: dict) -> dict:
+        """The card's entry as the current index stores it (keywords lowercased)."""
+        return dict(card, keywords=[kw.lower() for kw in card.get("keywords", [])])
+
+    def test_scores_match_baseline(self):
+        for card in self.cards:
+            with self.subTest(card=card["name"]):
+                self.assertEqual(
+                    inject.score_card(self.indexed(card), self.context),
+                    baseline_score_card(card, self.context),
+                )
+
+    def test_ranking_matches_baseline(self):
+        index = {"cards": {card["name"]: self.indexed(card) for card in self.cards}}
+
+        selected = inject.select_cards(index, self.context)
+        expected = baseline_select_cards(self.cards, self.context)
+
+        self.assertTrue(expected)
+        self.assertEqual(
+            [(entry["name"], relevance) for entry, relevance in selected],
+            [(entry["name"], relevance) for entry, relevance in expected],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,413 @@
+"""Tests for scripts/knowledge.py.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import knowledge  # noqa: E402
+from knowledge import KnowledgeCard, Triggers  # noqa: E402
+
+
+class KnowledgeBaseTestCase(unittest.TestCase):
+    """Points knowledge.py at a throwaway knowledge base."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        base = Path(tmp.name)
+        for name, value in {
+            "KNOWLEDGE_BASE_DIR": base,
+            "KNOWLEDGE_CARDS_DIR": base / "knowledge",
+            "INDEX_PATH": base / "_index.json",
+            "SESSION_LOG_PATH": base / "_session_log.json",
+            "REBUILD_STATE_PATH": base / "_rebuild_state.json",
+            "_index_cache": None,
+        }.items():
+            patcher = mock.patch.object(knowledge, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_card(self, name: str, **kwargs) -> KnowledgeCard:
+        card = KnowledgeCard(
+            name=name,
+            source="pasted-text",
+            captured="2026-01-01",
+            category="python",
+            triggers=Triggers(keywords=["pytest"]),
+            insight="Insight.",
+            injection_text="Do the thing.",
+            example="Example.",
+            **kwargs,
+        )
+        knowledge.write_card(card)
+        knowledge.add_card_to_index(card)
+        return card
+
+
+class LoadIndexTests(KnowledgeBaseTestCase):
+    def test_older_index_keywords_are_lowercased(self):
+        entry = {"name": "old-card", "file": "python/old-card.md", "keywords": ["PyTest", "CI"]}
+        older = {
+            1: [entry],
+            2: {"old-card": dict(entry, keywords_lc=["pytest", "ci"])},
+        }
+        for version, cards in older.items():
+            with self.subTest(version=version):
+                knowledge.INDEX_PATH.write_text(json.dumps({"version": version, "cards": cards}))
+
+                loaded = knowledge.load_index()["cards"]["old-card"]
+
+                self.assertEqual(loaded["keywords"], ["pytest", "ci"])
+                self.assertNotIn("keywords_lc", loaded)
+                self.assertEqual(knowledge.entry_keywords_lc(loaded), ["pytest", "ci"])
+
+    def test_malformed_legacy_entries_are_skipped(self):
+        good = {"name": "good-card", "file": "python/good-card.md", "keywords": ["PyTest"]}
+        older = {
+            1: [good, "not-an-entry", {"file": "python/nameless.md"}, None],
+            2: {"good-card": good, "bad-card": ["not", "a", "dict"]},
+        }
+        for version, cards in older.items():
+            with self.subTest(version=version):
+                knowledge.INDEX_PATH.write_text(json.dumps({"version": version, "cards": cards}))
+
+                with mock.patch("builtins.print"):
+                    loaded = knowledge.load_index()["cards"]
+
+                self.assertEqual(list(loaded), ["good-card"])
+                self.assertEqual(loaded["good-card"]["keywords"], ["pytest"])
+
+    def test_mutating_a_loaded_index_does_not_leak(self):
+        self.make_card("shared")
+
+        index = knowledge.load_index()
+        index["cards"]["shared"]["keywords"].append("leaked")
+        index["cards"]["shared"]["score"] = 0.99
+        del index["cards"]["shared"]
+        index["cards"]["ghost"] = {"name": "ghost"}
+
+        reloaded = knowledge.load_index()["cards"]
+        self.assertEqual(list(reloaded), ["shared"])
+        self.assertEqual(reloaded["shared"]["keywords"], ["pytest"])
+        self.assertEqual(reloaded["shared"]["score"], 0.5)
+
+    def test_saved_index_is_not_shared_with_the_caller(self):
+        index = knowledge.load_index()
+        index["cards"]["saved"] = {"name": "saved", "keywords": ["pytest"]}
+        knowledge.save_index(index)
+
+        index["cards"]["saved"]["keywords"].append("leaked")
+
+        self.assertEqual(knowledge.load_index()["cards"]["saved"]["keywords"], ["pytest"])
+
+
+class IndexTransactionTests(KnowledgeBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ("alpha", "beta"):
+            self.make_card(name)
+
+    def count_index_writes(self):
+        return mock.patch.object(knowledge, "_write_index", wraps=knowledge._write_index)
+
+    def test_index_is_written_once(self):
+        with self.count_index_writes() as write:
+            with knowledge.index_transaction():
+                knowledge.increment_surfaced("alpha")
+                knowledge.increment_surfaced("beta")
+                knowledge.update_card_score("alpha", 0.1)
+                write.assert_not_called()
+
+        write.assert_called_once()
+        on_disk = json.loads(knowledge.INDEX_PATH.read_text())["cards"]
+        self.assertEqual(on_disk["alpha"]["times_surfaced"], 1)
+        self.assertEqual(on_disk["alpha"]["score"], 0.6)
+        self.assertEqual(on_disk["beta"]["times_surfaced"], 1)
+
+    def test_nothing_saved_means_nothing_written(self):
+        with self.count_index_writes() as write:
+            with knowledge.index_transaction():
+                knowledge.find_card_in_index("alpha")
+
+        write.assert_not_called()
+
+    def test_nested_transactions_join_the_outer_one(self):
+        with self.count_index_writes() as write:
+            with knowledge.index_transaction() as outer:
+                with knowledge.index_transaction() as inner:
+                    self.assertIs(inner, outer)
+                    knowledge.increment_surfaced("alpha")
+                write.assert_not_called()
+                self.assertIs(knowledge.load_index(), outer)
+                knowledge.increment_surfaced("beta")
+
+        write.assert_called_once()
+        on_disk = json.loads(knowledge.INDEX_PATH.read_text())["cards"]
+        self.assertEqual(on_disk["alpha"]["times_surfaced"], 1)
+        self.assertEqual(on_disk["beta"]["times_surfaced"], 1)
+
+    def test_exception_leaves_disk_unchanged_and_drops_cache(self):
+        before = knowledge.INDEX_PATH.read_bytes()
+        knowledge.load_index()
+        self.assertIsNotNone(knowledge._index_cache)
+
+        with self.assertRaises(RuntimeError):
+            with knowledge.index_transaction() as index:
+                index["cards"]["alpha"]["score"] = 0.99
+                knowledge.save_index(index)
+                raise RuntimeError("boom")
+
+        self.assertEqual(knowledge.INDEX_PATH.read_bytes(), before)
+        self.assertIsNone(knowledge._index_cache)
+        self.assertEqual(knowledge.load_index()["cards"]["alpha"]["score"], 0.5)
+
+
+class ReplaceFileTests(KnowledgeBaseTestCase):
+    def test_failed_write_leaves_no_temp_file(self):
+        path = knowledge.KNOWLEDGE_BASE_DIR / "target.json"
+        path.write_bytes(b"old")
+
+        with mock.patch.object(knowledge.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                knowledge._replace_file(path, b"new")
+
+        self.assertEqual(os.listdir(knowledge.KNOWLEDGE_BASE_DIR), ["target.json"])
+        self.assertEqual(path.read_bytes(), b"old")
+
+    def test_replaced_file_keeps_its_permissions(self):
+        card = self.make_card("private")
+        os.chmod(card.file_path, 0o600)
+        os.chmod(knowledge.INDEX_PATH, 0o640)
+
+        knowledge.update_card_score("private", 0.1)
+
+        self.assertEqual(os.stat(card.file_path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(knowledge.INDEX_PATH).st_mode & 0o777, 0o640)
+
+
+class BumpCardTests(KnowledgeBaseTestCase):
+    def bump_both_ways(self, text: str) -> tuple[str, str, bool]:
+        """Bump a card via _bump_card() and via update_card_metadata().
+
+        Returns both results and whether _bump_card() fell back.
+        """
+        card = self.make_card("bumped")
+        path = card.file_path
+        path.write_text(text)
+        with mock.patch.object(
+            knowledge, "update_card_metadata", wraps=knowledge.update_card_metadata
+        ) as slow:
+            self.assertEqual(knowledge._bump_card(path, 0.1, 1, 1), (0.6, 1, 1))
+        fast_text = path.read_text()
+
+        path.write_text(text)
+        knowledge.update_card_metadata(path, score=0.6, times_surfaced=1, times_useful=1)
+        return fast_text, path.read_text(), slow.called
+
+    def test_fast_path_matches_slow_path(self):
+        text = self.make_card("template").file_path.read_text()
+
+        fast, slow, fell_back = self.bump_both_ways(text)
+
+        self.assertFalse(fell_back)
+        self.assertEqual(fast, slow)
+
+    def test_unexpected_counter_lines_fall_back(self):
+        text = self.make_card("template").file_path.read_text()
+        variants = {
+            "trailing comment": text.replace("score: 0.5", "score: 0.5  # tuned by hand"),
+            "missing": text.replace("times_surfaced: 0\n", ""),
+            "out of order": text.replace("score: 0.5\n", "").replace(
+                "times_useful: 0\n", "times_useful: 0\nscore: 0.5\n"
+            ),
+        }
+        for variant, edited in variants.items():
+            with self.subTest(variant):
+                self.assertNotEqual(edited, text)
+
+                fast, slow, fell_back = self.bump_both_ways(edited)
+
+                self.assertTrue(fell_back)
+                self.assertEqual(fast, slow)
+                reread = knowledge.read_card(knowledge.KNOWLEDGE_CARDS_DIR / "python" / "bumped.md")
+                self.assertEqual(
+                    (reread.score, reread.times_surfaced, reread.times_useful), (0.6, 1, 1)
+                )
+                self.assertEqual(reread.injection_text, "Do the thing.")
+
+    def test_leading_blank_line(self):
+        card = self.make_card("leading-blank")
+        path = card.file_path
+        path.write_text("\n" + path.read_text().replace("score: 0.5", "score: '0.5'"))
+
+        self.assertEqual(knowledge.update_card_score("leading-blank", 0.1), 0.6)
+        reread = knowledge.read_card(path)
+        self.assertEqual(reread.score, 0.6)
+        self.assertEqual(reread.injection_text, "Do the thing.")
+
+    def test_crlf_card_keeps_crlf(self):
+        card = self.make_card("crlf")
+        path = card.file_path
+        original = path.read_text()
+        for text in (original, original.replace("score: 0.5", "score: '0.5'")):
+            with self.subTest(fallback=text != original):
+                path.write_bytes(text.replace("\n", "\r\n").encode())
+                knowledge.batch_update_scores([("crlf", 0.1, True)])
+
+                data = path.read_bytes()
+                self.assertEqual(data.count(b"\n"), data.count(b"\r\n"))
+                reread = knowledge.read_card(path)
+                self.assertEqual(reread.injection_text, "Do the thing.")
+                self.assertEqual((reread.score, reread.times_useful), (0.6, 1))
+
+
+class BatchUpdateScoresTests(KnowledgeBaseTestCase):
+    def test_failure_partway_keeps_index_in_step_with_files(self):
+        for name in ("first", "broken", "third"):
+            self.make_card(name)
+        (knowledge.KNOWLEDGE_CARDS_DIR / "python" / "broken.md").write_text("not a card\n")
+
+        with self.assertRaises(ValueError):
+            knowledge.batch_update_scores(
+                [("first", 0.1, True), ("broken", 0.1, True), ("third", 0.1, True)]
+            )
+
+        on_disk = json.loads(knowledge.INDEX_PATH.read_text())["cards"]
+        for name, expected in (("first", (0.6, 1)), ("third", (0.5, 0))):
+            with self.subTest(card=name):
+                card = knowledge.read_card(knowledge.KNOWLEDGE_CARDS_DIR / "python" / f"{name}.md")
+                self.assertEqual((card.score, card.times_useful), expected)
+                entry = on_disk[name]
+                self.assertEqual((entry["score"], entry["times_useful"]), expected)
+
+
+class CreateCardsTests(KnowledgeBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(knowledge, "count_tokens", return_value=3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def spec(self, name: str) -> dict:
+        return {
+            "name": name,
+            "source": "pasted-text",
+            "category": "python",
+            "insight": "Insight.",
+            "injection_text": "Do the thing.",
+            "example": "Example.",
+            "keywords": ["pytest"],
+        }
+
+    def card_files(self) -> list[str]:
+        return sorted(p.name for p in knowledge.KNOWLEDGE_CARDS_DIR.rglob("*.md"))
+
+    def test_invalid_spec_writes_nothing(self):
+        bad = self.spec("bad")
+        del bad["keywords"]
+
+        with self.assertRaises(TypeError):
+            knowledge.create_cards([self.spec("first"), bad])
+
+        self.assertEqual(self.card_files(), [])
+        self.assertEqual(knowledge.load_index()["cards"], {})
+
+    def test_failed_write_rolls_back_files(self):
+        existing = self.make_card("existing")
+        before = existing.file_path.read_bytes()
+        real_write_card = knowledge.write_card
+
+        def write_card(card):
+            if card.name == "third":
+                raise OSError("disk full")
+            return real_write_card(card)
+
+        with mock.patch.object(knowledge, "write_card", side_effect=write_card):
+            with self.assertRaises(OSError):
+                knowledge.create_cards(
+                    [self.spec("first"), self.spec("existing"), self.spec("third")]
+                )
+
+        self.assertEqual(self.card_files(), ["existing.md"])
+        self.assertEqual(existing.file_path.read_bytes(), before)
+        self.assertEqual(list(knowledge.load_index()["cards"]), ["existing"])
+
+
+class RebuildIndexTests(KnowledgeBaseTestCase):
+    def test_symlinked_directories_are_not_followed(self):
+        self.make_card("real-card")
+        cards_dir = knowledge.KNOWLEDGE_CARDS_DIR
+        (cards_dir / "python" / "loop").symlink_to(cards_dir, target_is_directory=True)
+        (cards_dir / "alias").symlink_to(cards_dir / "python", target_is_directory=True)
+
+        index = knowledge.rebuild_index()
+
+        self.assertEqual(list(index["cards"]), ["real-card"])
+        self.assertEqual(index["cards"]["real-card"]["file"], "python/real-card.md")
+
+
+class IncrementalRebuildTests(KnowledgeBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ("alpha", "beta", "gamma"):
+            self.make_card(name)
+        knowledge.rebuild_index()
+        self.full = knowledge.load_index()["cards"]
+
+    def rebuild(self) -> list[str]:
+        """Run an incremental rebuild; return the names of the cards it re-read."""
+        with mock.patch.object(
+            knowledge, "_index_entry_for", wraps=knowledge._index_entry_for
+        ) as read:
+            index = knowledge.rebuild_index(incremental=True)
+        self.assertEqual(index["cards"], self.full)
+        return sorted(call.args[0].stem for call in read.call_args_list)
+
+    def test_unchanged_files_are_reused(self):
+        self.assertEqual(self.rebuild(), [])
+
+        path = knowledge.KNOWLEDGE_CARDS_DIR / "python" / "beta.md"
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(self.rebuild(), ["beta"])
+
+    def test_card_removed_from_index_is_reread(self):
+        knowledge.remove_card_from_index("beta")
+
+        self.assertEqual(self.rebuild(), ["beta"])
+
+    def test_unusable_state_falls_back_to_full_rebuild(self):
+        state_path = knowledge.REBUILD_STATE_PATH
+        good = json.loads(state_path.read_text())
+        variants = {
+            "missing": None,
+            "corrupt": "{not json",
+            "wrong version": json.dumps(dict(good, version=1)),
+            "not an object": "[]",
+            "bad file records": json.dumps(
+                dict(good, files={rel: "junk" for rel in good["files"]})
+            ),
+        }
+        for variant, text in variants.items():
+            with self.subTest(variant):
+                if text is None:
+                    state_path.unlink()
+                else:
+                    state_path.write_text(text)
+
+                self.assertEqual(self.rebuild(), ["alpha", "beta", "gamma"])
+                self.assertEqual(json.loads(state_path.read_text()), good)
+
+
+if __name__ == "__main__":
+    unittest.main()